@@ -0,0 +1,424 @@
+/*
+ * Optional compiled kernels for the GA hot loops (CPython C API, no third-party deps).
+ *
+ * Build:  python setup.py build_ext --inplace
+ *
+ * Every function mirrors a pure-Python loop in the repo and keeps its exact order of
+ * floating point operations, so both backends return the same values. Instance data is
+ * read from typed buffers (float64 distance matrix, int64 demand/priority/capacity
+ * vectors); routes and chromosomes are plain Python sequences of delivery IDs.
+ * The dispatcher is _kernels.py.
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stdint.h>
+#include <string.h>
+
+/* ---------- buffer helpers ---------- */
+
+static int
+get_matrix(PyObject *obj, Py_buffer *view)
+{
+    if (PyObject_GetBuffer(obj, view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) < 0)
+        return -1;
+    if (view->ndim != 2 || view->shape[0] != view->shape[1] ||
+        view->itemsize != sizeof(double) || strcmp(view->format, "d") != 0) {
+        PyBuffer_Release(view);
+        PyErr_SetString(PyExc_TypeError, "expected a square C-contiguous float64 matrix");
+        return -1;
+    }
+    return 0;
+}
+
+static int
+get_int64_vector(PyObject *obj, Py_buffer *view)
+{
+    if (PyObject_GetBuffer(obj, view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) < 0)
+        return -1;
+    if (view->ndim != 1 || view->itemsize != sizeof(int64_t) ||
+        (strcmp(view->format, "l") != 0 && strcmp(view->format, "q") != 0)) {
+        PyBuffer_Release(view);
+        PyErr_SetString(PyExc_TypeError, "expected a contiguous int64 vector");
+        return -1;
+    }
+    return 0;
+}
+
+/* Copy a sequence of delivery IDs into a C array, checking every ID against `size`. */
+static Py_ssize_t *
+read_ids(PyObject *seq_obj, Py_ssize_t size, Py_ssize_t *length)
+{
+    PyObject *seq = PySequence_Fast(seq_obj, "expected a sequence of delivery IDs");
+    if (seq == NULL)
+        return NULL;
+
+    Py_ssize_t n = PySequence_Fast_GET_SIZE(seq);
+    Py_ssize_t *ids = PyMem_Malloc((n > 0 ? n : 1) * sizeof(Py_ssize_t));
+    if (ids == NULL) {
+        Py_DECREF(seq);
+        PyErr_NoMemory();
+        return NULL;
+    }
+
+    PyObject **items = PySequence_Fast_ITEMS(seq);
+    for (Py_ssize_t k = 0; k < n; k++) {
+        Py_ssize_t id = PyNumber_AsSsize_t(items[k], PyExc_IndexError);
+        if (id == -1 && PyErr_Occurred()) {
+            PyMem_Free(ids);
+            Py_DECREF(seq);
+            return NULL;
+        }
+        if (id < 0 || id >= size) {
+            PyMem_Free(ids);
+            Py_DECREF(seq);
+            PyErr_Format(PyExc_IndexError, "delivery ID %zd out of range", id);
+            return NULL;
+        }
+        ids[k] = id;
+    }
+
+    Py_DECREF(seq);
+    *length = n;
+    return ids;
+}
+
+static double
+ids_path_cost(const double *m, Py_ssize_t n, const Py_ssize_t *path, Py_ssize_t length)
+{
+    double cost = 0.0;
+    for (Py_ssize_t k = 0; k + 1 < length; k++)
+        cost += m[path[k] * n + path[k + 1]];
+    return cost;
+}
+
+/* ---------- DistanceMatrix.route_distance / path_cost ---------- */
+
+static PyObject *
+accel_route_distance(PyObject *self, PyObject *args)
+{
+    PyObject *matrix_obj, *route_obj;
+    if (!PyArg_ParseTuple(args, "OO", &matrix_obj, &route_obj))
+        return NULL;
+
+    Py_buffer matrix;
+    if (get_matrix(matrix_obj, &matrix) < 0)
+        return NULL;
+    const double *m = matrix.buf;
+    Py_ssize_t n = matrix.shape[0];
+
+    Py_ssize_t length;
+    Py_ssize_t *route = read_ids(route_obj, n, &length);
+    if (route == NULL) {
+        PyBuffer_Release(&matrix);
+        return NULL;
+    }
+    if (length == 0) {
+        PyMem_Free(route);
+        PyBuffer_Release(&matrix);
+        PyErr_SetString(PyExc_IndexError, "empty route");
+        return NULL;
+    }
+
+    double distance = m[route[0]];
+    for (Py_ssize_t k = 0; k + 1 < length; k++)
+        distance += m[route[k] * n + route[k + 1]];
+    distance += m[route[length - 1] * n];
+
+    PyMem_Free(route);
+    PyBuffer_Release(&matrix);
+    return PyFloat_FromDouble(distance);
+}
+
+static PyObject *
+accel_path_cost(PyObject *self, PyObject *args)
+{
+    PyObject *matrix_obj, *path_obj;
+    if (!PyArg_ParseTuple(args, "OO", &matrix_obj, &path_obj))
+        return NULL;
+
+    Py_buffer matrix;
+    if (get_matrix(matrix_obj, &matrix) < 0)
+        return NULL;
+
+    Py_ssize_t length;
+    Py_ssize_t *path = read_ids(path_obj, matrix.shape[0], &length);
+    if (path == NULL) {
+        PyBuffer_Release(&matrix);
+        return NULL;
+    }
+
+    double cost = ids_path_cost(matrix.buf, matrix.shape[0], path, length);
+
+    PyMem_Free(path);
+    PyBuffer_Release(&matrix);
+    return PyFloat_FromDouble(cost);
+}
+
+/* ---------- _encode_decode.split_routes ---------- */
+
+static PyObject *
+accel_split_routes(PyObject *self, PyObject *args)
+{
+    PyObject *demand_obj, *capacity_obj, *vehicle_ids_obj, *remaining_obj;
+    long long min_demand, start_slot;
+    int routes_created;
+    if (!PyArg_ParseTuple(args, "OOOLOLp", &demand_obj, &capacity_obj, &vehicle_ids_obj,
+                          &min_demand, &remaining_obj, &start_slot, &routes_created))
+        return NULL;
+
+    Py_buffer demand_view, capacity_view;
+    if (get_int64_vector(demand_obj, &demand_view) < 0)
+        return NULL;
+    if (get_int64_vector(capacity_obj, &capacity_view) < 0) {
+        PyBuffer_Release(&demand_view);
+        return NULL;
+    }
+    const int64_t *demand = demand_view.buf;
+    const int64_t *capacity = capacity_view.buf;
+    Py_ssize_t n_vehicles = capacity_view.shape[0];
+
+    PyObject *vehicle_ids = NULL, *all_routes = NULL;
+    Py_ssize_t *remaining = NULL, *unassigned = NULL, *route = NULL;
+    Py_ssize_t n_remaining = 0;
+
+    vehicle_ids = PySequence_Fast(vehicle_ids_obj, "vehicle_ids must be a sequence");
+    if (vehicle_ids == NULL)
+        goto error;
+    if (n_vehicles == 0 || PySequence_Fast_GET_SIZE(vehicle_ids) != n_vehicles) {
+        PyErr_SetString(PyExc_ValueError, "vehicle_ids and capacity must be non-empty and of the same length");
+        goto error;
+    }
+
+    remaining = read_ids(remaining_obj, demand_view.shape[0], &n_remaining);
+    if (remaining == NULL)
+        goto error;
+    unassigned = PyMem_Malloc((n_remaining > 0 ? n_remaining : 1) * sizeof(Py_ssize_t));
+    route = PyMem_Malloc((n_remaining > 0 ? n_remaining : 1) * sizeof(Py_ssize_t));
+    if (unassigned == NULL || route == NULL) {
+        PyErr_NoMemory();
+        goto error;
+    }
+
+    all_routes = PyList_New(0);
+    if (all_routes == NULL)
+        goto error;
+
+    long long slot = start_slot;
+    while (n_remaining > 0) {
+        Py_ssize_t v_pos = (Py_ssize_t)(slot % n_vehicles);
+        if (v_pos == 0)
+            routes_created = 0;
+
+        int64_t cap = capacity[v_pos];
+        int64_t load = 0;
+        Py_ssize_t route_length = 0, n_unassigned = 0;
+
+        for (Py_ssize_t k = 0; k < n_remaining; k++) {
+            Py_ssize_t gene = remaining[k];
+            int64_t d = demand[gene];
+            if (load + d <= cap) {
+                route[route_length++] = gene;
+                load += d;
+                if (cap - load < min_demand) {
+                    Py_ssize_t tail = n_remaining - k - 1;
+                    memcpy(unassigned + n_unassigned, remaining + k + 1, tail * sizeof(Py_ssize_t));
+                    n_unassigned += tail;
+                    break;
+                }
+            }
+            else {
+                unassigned[n_unassigned++] = gene;
+            }
+        }
+
+        Py_ssize_t *swap = remaining;
+        remaining = unassigned;
+        unassigned = swap;
+        n_remaining = n_unassigned;
+
+        if (route_length > 0) {
+            PyObject *route_tuple = PyTuple_New(route_length);
+            if (route_tuple == NULL)
+                goto error;
+            for (Py_ssize_t k = 0; k < route_length; k++) {
+                PyObject *gene = PyLong_FromSsize_t(route[k]);
+                if (gene == NULL) {
+                    Py_DECREF(route_tuple);
+                    goto error;
+                }
+                PyTuple_SET_ITEM(route_tuple, k, gene);
+            }
+            PyObject *item = Py_BuildValue("(LON)", slot, PySequence_Fast_GET_ITEM(vehicle_ids, v_pos), route_tuple);
+            if (item == NULL)
+                goto error;
+            int failed = PyList_Append(all_routes, item);
+            Py_DECREF(item);
+            if (failed < 0)
+                goto error;
+            routes_created = 1;
+        }
+
+        slot++;
+        if (slot % n_vehicles == 0 && !routes_created)
+            break;
+    }
+
+    PyMem_Free(remaining);
+    PyMem_Free(unassigned);
+    PyMem_Free(route);
+    Py_DECREF(vehicle_ids);
+    PyBuffer_Release(&demand_view);
+    PyBuffer_Release(&capacity_view);
+    return all_routes;
+
+error:
+    PyMem_Free(remaining);
+    PyMem_Free(unassigned);
+    PyMem_Free(route);
+    Py_XDECREF(vehicle_ids);
+    Py_XDECREF(all_routes);
+    PyBuffer_Release(&demand_view);
+    PyBuffer_Release(&capacity_view);
+    return NULL;
+}
+
+/* ---------- c_fitness.route_fitness priority penalties ---------- */
+
+static PyObject *
+accel_priority_penalty(PyObject *self, PyObject *args)
+{
+    PyObject *priority_obj, *route_obj;
+    long long route_index;
+    double penalty, critical_weight, critical_pos_weight, high_weight, high_pos_weight;
+    if (!PyArg_ParseTuple(args, "OOLddddd", &priority_obj, &route_obj, &route_index, &penalty,
+                          &critical_weight, &critical_pos_weight, &high_weight, &high_pos_weight))
+        return NULL;
+
+    Py_buffer priority_view;
+    if (get_int64_vector(priority_obj, &priority_view) < 0)
+        return NULL;
+    const int64_t *priority = priority_view.buf;
+
+    Py_ssize_t length;
+    Py_ssize_t *route = read_ids(route_obj, priority_view.shape[0], &length);
+    if (route == NULL) {
+        PyBuffer_Release(&priority_view);
+        return NULL;
+    }
+
+    double index = (double)route_index;
+    double quadratic = (double)(route_index * route_index) * 2.0;
+    for (Py_ssize_t pos = 0; pos < length; pos++) {
+        int64_t p = priority[route[pos]];
+        if (p == 3)
+            penalty += (index * critical_weight + pos * critical_pos_weight) + quadratic;
+        else if (p == 2)
+            penalty += index * high_weight + pos * high_pos_weight;
+    }
+
+    PyMem_Free(route);
+    PyBuffer_Release(&priority_view);
+    return PyFloat_FromDouble(penalty);
+}
+
+/* ---------- d_crossover.BCRC insertion scoring ---------- */
+
+static PyObject *
+accel_insertion_ties(PyObject *self, PyObject *args)
+{
+    PyObject *matrix_obj, *base_obj, *subroute_obj;
+    if (!PyArg_ParseTuple(args, "OOO", &matrix_obj, &base_obj, &subroute_obj))
+        return NULL;
+
+    Py_buffer matrix;
+    if (get_matrix(matrix_obj, &matrix) < 0)
+        return NULL;
+    const double *m = matrix.buf;
+    Py_ssize_t n = matrix.shape[0];
+
+    Py_ssize_t n_base, n_sub;
+    Py_ssize_t *sub = NULL, *base = read_ids(base_obj, n, &n_base);
+    double *deltas = NULL;
+    PyObject *tied = NULL;
+    if (base == NULL)
+        goto done;
+    sub = read_ids(subroute_obj, n, &n_sub);
+    if (sub == NULL)
+        goto done;
+    if (n_base == 0 || n_sub == 0) {
+        PyErr_SetString(PyExc_ValueError, "base and subroute must be non-empty");
+        goto done;
+    }
+    deltas = PyMem_Malloc((n_base + 1) * sizeof(double));
+    if (deltas == NULL) {
+        PyErr_NoMemory();
+        goto done;
+    }
+
+    Py_ssize_t first = sub[0], last = sub[n_sub - 1];
+    deltas[0] = m[last * n + base[0]];
+    for (Py_ssize_t pos = 1; pos < n_base; pos++) {
+        Py_ssize_t a = base[pos - 1], b = base[pos];
+        deltas[pos] = m[a * n + first] + m[last * n + b] - m[a * n + b];
+    }
+    deltas[n_base] = m[base[n_base - 1] * n + first];
+
+    double best = deltas[0];
+    for (Py_ssize_t pos = 1; pos <= n_base; pos++)
+        if (deltas[pos] < best)
+            best = deltas[pos];
+
+    double tolerance = 1e-9 * (1.0 + ids_path_cost(m, n, base, n_base) + ids_path_cost(m, n, sub, n_sub));
+
+    tied = PyList_New(0);
+    if (tied == NULL)
+        goto done;
+    for (Py_ssize_t pos = 0; pos <= n_base; pos++) {
+        if (deltas[pos] - best <= tolerance) {
+            PyObject *value = PyLong_FromSsize_t(pos);
+            if (value == NULL || PyList_Append(tied, value) < 0) {
+                Py_XDECREF(value);
+                Py_CLEAR(tied);
+                goto done;
+            }
+            Py_DECREF(value);
+        }
+    }
+
+done:
+    PyMem_Free(base);
+    PyMem_Free(sub);
+    PyMem_Free(deltas);
+    PyBuffer_Release(&matrix);
+    return tied;
+}
+
+static PyMethodDef accel_methods[] = {
+    {"route_distance", accel_route_distance, METH_VARARGS,
+     "route_distance(matrix, route) -> float: depot -> route -> depot."},
+    {"path_cost", accel_path_cost, METH_VARARGS,
+     "path_cost(matrix, path) -> float: sum of consecutive legs (open path)."},
+    {"split_routes", accel_split_routes, METH_VARARGS,
+     "split_routes(demand, capacity, vehicle_ids, min_demand, remaining, start_slot, routes_created)"
+     " -> list of (slot, vehicle_id, route tuple)."},
+    {"priority_penalty", accel_priority_penalty, METH_VARARGS,
+     "priority_penalty(priority, route, route_index, penalty, critical_weight, critical_pos_weight,"
+     " high_weight, high_pos_weight) -> float: `penalty` plus the route's priority penalties."},
+    {"insertion_ties", accel_insertion_ties, METH_VARARGS,
+     "insertion_ties(matrix, base, subroute) -> list of the BCRC insertion positions tied for the lowest cost."},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef accel_module = {
+    PyModuleDef_HEAD_INIT,
+    "_accel",
+    "Compiled GA kernels (optional; see _kernels.py).",
+    -1,
+    accel_methods
+};
+
+PyMODINIT_FUNC
+PyInit__accel(void)
+{
+    return PyModule_Create(&accel_module);
+}
@@ -0,0 +1,32 @@
+import json
+import os
+import numpy as np
+
+def save_checkpoint(path: str, arrays: dict[str, np.ndarray], metadata: dict[str, any]):
+    """
+    Write `arrays` and the JSON-serializable `metadata` to a compressed .npz file.
+    The file is written next to `path` and then renamed, so an interrupted write never
+    replaces the previous checkpoint.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez_compressed(f, metadata=np.array(json.dumps(metadata)), **arrays)
+    os.replace(tmp_path, path)
+
+def load_checkpoint(path: str) -> tuple[dict[str, np.ndarray], dict[str, any]]:
+    with np.load(path) as data:
+        arrays = {name: data[name] for name in data.files if name != "metadata"}
+        metadata = json.loads(str(data["metadata"]))
+    return arrays, metadata
+
+def random_state_to_checkpoint(state: tuple) -> tuple[np.ndarray, dict[str, any]]:
+    """Split a `random.getstate()` tuple into the Mersenne Twister words and JSON metadata."""
+    version, internal_state, gauss_next = state
+    return np.array(internal_state, dtype=np.int64), {"version": version, "gauss_next": gauss_next}
+
+def random_state_from_checkpoint(words: np.ndarray, metadata: dict[str, any]) -> tuple:
+    return metadata["version"], tuple(int(w) for w in words), metadata["gauss_next"]
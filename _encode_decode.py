@@ -1,3 +1,6 @@
+import _kernels
+from delivery_setup.problem_instance import ProblemInstance
+
 def encode_individual(vehicle_routes: list[tuple[str, tuple[int]]]) -> list[int]:
     chromosome = []
 
@@ -6,48 +9,66 @@ def encode_individual(vehicle_routes: list[tuple[str, tuple[int]]]) -> list[int]
 
     return chromosome
 
-def decode_chromosome(chromosome, deliveries, vehicles) -> list[tuple[str, tuple[int]]]:
+def decode_chromosome(chromosome, instance: ProblemInstance) -> list[tuple[str, tuple[int]]]:
+    return [(v, route) for _, v, route in split_routes(list(chromosome), instance)]
+
+def split_routes(remaining_deliveries: list[int], instance: ProblemInstance, start_slot: int = 0, routes_created: bool = False) -> list[tuple[int, str, tuple[int]]]:
+    """
+    Greedy capacity-first-fit split used by decode_chromosome. Each route comes with its
+    slot (round * n_vehicles + vehicle position), so a split can be resumed mid-round from
+    `start_slot` given the deliveries still unassigned at that point.
+    """
+    if _kernels.accel is not None:
+        return _kernels.accel.split_routes(instance.demand_array, instance.capacity_array, instance.vehicle_ids,
+            instance.min_demand, remaining_deliveries, start_slot, routes_created)
+
+    demands = instance.demand
+    min_demand = instance.min_demand
+    vehicle_ids = instance.vehicle_ids
+    capacities = instance.capacity
+    n_vehicles = len(vehicle_ids)
     all_routes = []
-    vehicle_trips = {v: 0 for v in vehicles}
-    
-    # Create a list to track which deliveries haven't been assigned yet
-    remaining_deliveries = list(chromosome)
+    slot = start_slot
     
     while remaining_deliveries:
-        # Try to create routes for all vehicles in this round
-        routes_created = False
+        v_pos = slot % n_vehicles
+        if v_pos == 0:
+            # Try to create routes for all vehicles in this round
+            routes_created = False
         
-        for v, info in vehicles.items():
-            if not remaining_deliveries:
-                break
-                
-            current_route = []
-            current_load = 0
-            
-            # Build a route for this vehicle
-            deliveries_to_remove = []
+        capacity = capacities[v_pos]
+        current_route = []
+        current_load = 0
+        
+        # Build a route for this vehicle, compacting the unassigned genes in the same pass
+        unassigned = []
+        
+        for k, gene in enumerate(remaining_deliveries):
+            demand = demands[gene]
             
-            for gene in remaining_deliveries:
-                demand = deliveries[gene]["demand"]
+            # Check capacity constraint
+            if current_load + demand <= capacity:
+                current_route.append(gene)
+                current_load += demand
                 
-                # Check capacity constraint
-                if current_load + demand <= info["capacity"]:
-                    current_route.append(gene)
-                    current_load += demand
-                    deliveries_to_remove.append(gene)
-            
-            # Remove assigned deliveries from remaining list
-            for gene in deliveries_to_remove:
-                remaining_deliveries.remove(gene)
-            
-            # Add route if it has deliveries
-            if current_route:
-                all_routes.append((v, tuple(current_route)))
-                vehicle_trips[v] += 1
-                routes_created = True
+                # Vehicle full: no later gene can fit, keep the tail as is
+                if capacity - current_load < min_demand:
+                    unassigned.extend(remaining_deliveries[k + 1:])
+                    break
+            else:
+                unassigned.append(gene)
+        
+        remaining_deliveries = unassigned
+        
+        # Add route if it has deliveries
+        if current_route:
+            all_routes.append((slot, vehicle_ids[v_pos], tuple(current_route)))
+            routes_created = True
+        
+        slot += 1
         
-        # If no routes were created in this iteration, break to avoid infinite loop
-        if not routes_created:
+        # If no routes were created in this round, break to avoid infinite loop
+        if slot % n_vehicles == 0 and not routes_created:
             break
     
     return all_routes
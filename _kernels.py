@@ -0,0 +1,30 @@
+"""
+Backend selection for the GA hot loops.
+
+`accel` is the compiled `_accel` extension (built with `python setup.py build_ext --inplace`)
+when it is importable, or None, in which case DistanceMatrix, split_routes, route_fitness and
+BCRC run their pure-Python loops. Set GA_PURE_PYTHON=1 to force the fallback.
+"""
+import os
+
+try:
+    import _accel
+except ImportError:
+    _accel = None
+
+accel = None if os.environ.get("GA_PURE_PYTHON") == "1" else _accel
+
+def backend() -> str:
+    return "c" if accel is not None else "python"
+
+def set_backend(name: str):
+    """Switch between the compiled ("c") and pure-Python ("python") kernels at runtime."""
+    global accel
+    if name == "python":
+        accel = None
+    elif name == "c":
+        if _accel is None:
+            raise ImportError("The _accel extension is not built: run `python setup.py build_ext --inplace`.")
+        accel = _accel
+    else:
+        raise ValueError(f"Unknown kernel backend '{name}'.")
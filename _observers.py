@@ -0,0 +1,111 @@
+import collections
+import json
+import os
+import time
+
+class GenerationObserver:
+    """
+    Receives the events of a GeneticAlgorithm run; subclasses override the ones they need.
+
+    - on_generation(record): after each generation is evaluated, with `generation`, `best`,
+      `avg`, `worst`, `best_overall`, `stop_reason` (None while running), `final` (last
+      generation of the run) and, with the fitness cache, `cache` (hit/miss statistics).
+    - on_improvement(record): when the best solution so far improves, with `generation`,
+      `fitness`, `previous` (None at the first generation) and `chromosome`.
+    - on_finish(result): once, with the dictionary returned by run().
+    """
+    def on_generation(self, record: dict[str, any]):
+        pass
+
+    def on_improvement(self, record: dict[str, any]):
+        pass
+
+    def on_finish(self, result: dict[str, any]):
+        pass
+
+class ConsoleLogger(GenerationObserver):
+    """
+    Progress line every `interval` generations (and at the last one), skipped when the
+    previous line is less than `min_seconds` old.
+    """
+    def __init__(self, interval: int = 100, min_seconds: float = 0.0):
+        self.interval = interval
+        self.min_seconds = min_seconds
+        self.last_print = None
+
+    def on_generation(self, record: dict[str, any]):
+        if not record['final']:
+            if record['generation'] % self.interval != 0:
+                return
+            if self.last_print is not None and time.perf_counter() - self.last_print < self.min_seconds:
+                return
+        self.last_print = time.perf_counter()
+
+        cache_info = ""
+        if 'cache' in record:
+            stats = record['cache']
+            cache_info = f" | Cache: {stats['hits']}/{stats['hits'] + stats['misses']} hits"
+        print(f"Geração {record['generation']:3d} | Melhor: {record['best']:.2f} | Média: {record['avg']:.2f} | Pior: {record['worst']:.2f}{cache_info}")
+
+class JSONLWriter(GenerationObserver):
+    """
+    Writes one JSON line per event ("event": generation, improvement or finish) to `path`.
+    Lines are buffered and written `batch_size` at a time, so a generation costs one
+    json.dumps; the buffer is flushed when the run finishes. The file is opened on the
+    first write (the writer can be sent to another process before the run), truncating it
+    unless `append` is set (e.g. when resuming from a checkpoint).
+    """
+    def __init__(self, path: str, batch_size: int = 100, every: int = 1, append: bool = False):
+        self.path = path
+        self.batch_size = batch_size
+        self.every = every
+        self.append = append
+        self.buffer = []
+
+    def on_generation(self, record: dict[str, any]):
+        if record['generation'] % self.every == 0 or record['final']:
+            self.write({'event': 'generation', **record})
+
+    def on_improvement(self, record: dict[str, any]):
+        self.write({'event': 'improvement', **record})
+
+    def on_finish(self, result: dict[str, any]):
+        self.write({'event': 'finish', **result})
+        self.flush()
+
+    def write(self, event: dict[str, any]):
+        self.buffer.append(json.dumps(event))
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a" if self.append else "w", encoding="utf-8") as f:
+            f.write("\n".join(self.buffer) + "\n")
+        # Later batches of the same run go after this one
+        self.append = True
+        self.buffer.clear()
+
+class RingBuffer(GenerationObserver):
+    """
+    Keeps the last `capacity` generation records in memory, plus every improvement and the
+    final result. Only useful in the process that runs the GA (islands in worker processes
+    fill their own copy).
+    """
+    def __init__(self, capacity: int = 1000):
+        self.generations = collections.deque(maxlen=capacity)
+        self.improvements = []
+        self.result = None
+
+    def on_generation(self, record: dict[str, any]):
+        self.generations.append(record)
+
+    def on_improvement(self, record: dict[str, any]):
+        self.improvements.append(record)
+
+    def on_finish(self, result: dict[str, any]):
+        self.result = result
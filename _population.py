@@ -0,0 +1,92 @@
+import random
+import numpy as np
+from _encode_decode import decode_chromosome
+from d_crossover import crossover
+from e_mutation import light_mutation_draw, apply_move_inplace
+from delivery_setup.problem_instance import ProblemInstance
+
+def gene_dtype(max_gene: int) -> np.dtype:
+    return np.dtype(np.int16) if max_gene < np.iinfo(np.int16).max else np.dtype(np.int32)
+
+class Population:
+    """
+    Array-backed population: one contiguous (size x n_genes) integer matrix of chromosomes
+    and a float64 fitness vector (NaN = not evaluated).
+
+    Selection and crossover write into a preallocated twin buffer that is then swapped in,
+    and mutation works in place, so a generation allocates no per-individual objects.
+    """
+    def __init__(self, chromosomes: np.ndarray, fitness: np.ndarray = None):
+        chromosomes = np.asarray(chromosomes)
+        self.chromosomes = np.ascontiguousarray(chromosomes, dtype=gene_dtype(int(chromosomes.max())))
+        self.fitness = np.full(len(self.chromosomes), np.nan) if fitness is None else np.asarray(fitness, dtype=np.float64).copy()
+        self.buffer = np.empty_like(self.chromosomes)
+        self.fitness_buffer = np.empty_like(self.fitness)
+
+    @classmethod
+    def from_chromosomes(cls, chromosomes: list[list[int]]) -> "Population":
+        return cls(np.array(chromosomes))
+
+    def __len__(self) -> int:
+        return len(self.chromosomes)
+
+    @property
+    def n_genes(self) -> int:
+        return self.chromosomes.shape[1]
+
+    def chromosome(self, index: int) -> list[int]:
+        return self.chromosomes[index].tolist()
+
+    def individual(self, index: int) -> dict:
+        return {"chromosome": self.chromosome(index), "fitness": float(self.fitness[index])}
+
+    def best_index(self) -> int:
+        return int(np.argmin(self.fitness))
+
+    def swap_buffers(self):
+        self.chromosomes, self.buffer = self.buffer, self.chromosomes
+        self.fitness, self.fitness_buffer = self.fitness_buffer, self.fitness
+
+    def select(self, indices: np.ndarray):
+        """Replace the population by the individuals at `indices` (repetitions allowed)."""
+        indices = np.asarray(indices, dtype=np.intp)
+        if len(indices) != len(self):
+            self.buffer = np.empty((len(indices), self.n_genes), dtype=self.chromosomes.dtype)
+            self.fitness_buffer = np.empty(len(indices))
+
+        np.take(self.chromosomes, indices, axis=0, out=self.buffer)
+        np.take(self.fitness, indices, out=self.fitness_buffer)
+        self.swap_buffers()
+
+    def crossover(self, parents: np.ndarray, instance: ProblemInstance, operator=crossover, rng: random.Random = None):
+        """Replace the population by one child per (parent1, parent2) row of `parents`."""
+        parents = np.asarray(parents, dtype=np.intp)
+        if len(parents) != len(self):
+            self.buffer = np.empty((len(parents), self.n_genes), dtype=self.chromosomes.dtype)
+            self.fitness_buffer = np.empty(len(parents))
+
+        # Route splits of parent1 decoded at most once per generation, only when RBX needs them
+        route_splits = {}
+
+        def routes_of(index: int, chromosome: list[int]):
+            def lazy_split():
+                if index not in route_splits:
+                    route_splits[index] = decode_chromosome(chromosome, instance)
+                return route_splits[index]
+            return lazy_split
+
+        for k, (p1, p2) in enumerate(parents.tolist()):
+            parent1 = self.chromosome(p1)
+            self.buffer[k] = operator(parent1, self.chromosome(p2), instance, routes_p1=routes_of(p1, parent1), rng=rng)
+
+        self.fitness_buffer.fill(np.nan)
+        self.swap_buffers()
+
+    def mutate(self, prob: float, rng: random.Random = None):
+        """Light mutation (swap or relocate) applied in place to every chromosome."""
+        size = self.n_genes
+        for k in range(len(self)):
+            move = light_mutation_draw(size, prob, rng)
+            if move is not None:
+                apply_move_inplace(self.chromosomes[k], move)
+                self.fitness[k] = np.nan
@@ -0,0 +1,83 @@
+import cProfile
+import time
+
+# Generation phases timed by PhaseProfiler, in execution order
+EVALUATION = "evaluation"
+STATISTICS = "statistics"  # history, best solution, stop criteria and progress output
+SELECTION = "selection"    # survivors and parent tournaments
+CROSSOVER = "crossover"
+MUTATION = "mutation"
+PHASES = (EVALUATION, STATISTICS, SELECTION, CROSSOVER, MUTATION)
+
+class PhaseProfiler:
+    """
+    Per-phase wall-clock breakdown of every generation, measured by GeneticAlgorithm with
+    perf_counter_ns (integer nanoseconds, so long runs accumulate without rounding).
+    Without a profiler the GA skips every timing call.
+
+    Args:
+        callbacks: Called as callback(generation, timings) after each generation, with
+            `timings` mapping each phase and 'total' to nanoseconds.
+        cprofile_window: (first, last) generations, inclusive, to run under cProfile.
+        cprofile_path: pstats file written when the window closes (or the run stops inside it);
+            read it with `python -m pstats <file>`.
+    """
+    def __init__(self, callbacks: tuple = (), cprofile_window: tuple[int, int] = None, cprofile_path: str = "ga_profile.pstats"):
+        self.callbacks = tuple(callbacks)
+        self.cprofile_window = cprofile_window
+        self.cprofile_path = cprofile_path
+        self.start()
+
+    def start(self):
+        """Reset the timing history at the beginning of a run."""
+        self.history = {'generation': [], **{phase: [] for phase in PHASES}, 'total': []}
+        self.profile = None
+
+    def start_generation(self, generation: int):
+        self.generation = generation
+        self.timings = dict.fromkeys(PHASES, 0)
+        if self.cprofile_window is not None and self.profile is None:
+            first, last = self.cprofile_window
+            if first <= generation <= last:
+                self.profile = cProfile.Profile()
+                self.profile.enable()
+        self.generation_start = self.lap_start = time.perf_counter_ns()
+
+    def lap(self, phase: str):
+        """Charge the time since the previous lap (or the generation start) to `phase`."""
+        now = time.perf_counter_ns()
+        self.timings[phase] += now - self.lap_start
+        self.lap_start = now
+
+    def end_generation(self):
+        self.timings['total'] = time.perf_counter_ns() - self.generation_start
+        self.history['generation'].append(self.generation)
+        for key, value in self.timings.items():
+            self.history[key].append(value)
+
+        for callback in self.callbacks:
+            callback(self.generation, self.timings)
+
+        if self.profile is not None and self.generation >= self.cprofile_window[1]:
+            self.dump_profile()
+
+    def finish(self):
+        """Close a cProfile window left open by a run that stopped inside it."""
+        if self.profile is not None:
+            self.dump_profile()
+
+    def dump_profile(self):
+        self.profile.disable()
+        self.profile.dump_stats(self.cprofile_path)
+        self.profile = None
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Total seconds and share of the generation time of each phase."""
+        total = sum(self.history['total'])
+        return {
+            phase: {
+                'seconds': sum(self.history[phase]) / 1e9,
+                'share': sum(self.history[phase]) / total if total else 0.0
+            }
+            for phase in PHASES
+        }
@@ -0,0 +1,24 @@
+import random
+import numpy as np
+
+def seed_sequence(seed: int | np.random.SeedSequence = None) -> np.random.SeedSequence:
+    """
+    Root SeedSequence of a run. Without a seed, the entropy is drawn from the `random`
+    module, so random.seed still reproduces an unseeded run.
+    """
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    return np.random.SeedSequence(seed if seed is not None else random.getrandbits(128))
+
+def python_rng(seed: np.random.SeedSequence) -> random.Random:
+    # 128 bits of the SeedSequence output as the Mersenne Twister seed
+    return random.Random(int.from_bytes(seed.generate_state(4, np.uint32).tobytes(), "little"))
+
+def operator_streams(seed: int | np.random.SeedSequence = None) -> tuple[random.Random, np.random.Generator]:
+    """
+    Independent streams of one GA run: a random.Random for the list-based operators
+    (initial population, crossover, mutation) and a NumPy Generator for the batched
+    selection draws.
+    """
+    operators_seed, selection_seed = seed_sequence(seed).spawn(2)
+    return python_rng(operators_seed), np.random.default_rng(selection_seed)
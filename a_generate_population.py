@@ -1,17 +1,24 @@
 import random
 
-def generate_population_coordinates(city: str, pop_size: int) -> list[tuple[float, float]]:
-    dev_setup = deliveries_solution_candidate(city)
-    dev_shuffle = random.sample(sorted(dev_setup.values()), len(dev_setup))
-    vei_shuffle = random.sample(sorted(dev_setup.keys()), len(dev_setup))
+def generate_population_coordinates(city: str, pop_size: int, rng: random.Random = None) -> list[tuple[float, float]]:
+    rng = rng if rng is not None else random  # Module functions: global generator
+    dev_setup = deliveries_solution_candidate(city, rng)
+    dev_shuffle = rng.sample(sorted(dev_setup.values()), len(dev_setup))
+    vei_shuffle = rng.sample(sorted(dev_setup.keys()), len(dev_setup))
     
     return [list(zip(vei_shuffle, dev_shuffle)) for _ in range(pop_size)]
 
-def deliveries_solution_candidate(city: str) -> dict[str, tuple[int, ...]]:
+def generate_population_permutations(delivery_ids: tuple[int, ...], pop_size: int, rng: random.Random = None) -> list[list[int]]:
+    """Random chromosomes (permutations of `delivery_ids`), for instances without a city setup."""
+    rng = rng if rng is not None else random
+    return [rng.sample(delivery_ids, len(delivery_ids)) for _ in range(pop_size)]
+
+def deliveries_solution_candidate(city: str, rng: random.Random = None) -> dict[str, tuple[int, ...]]:
+    rng = rng if rng is not None else random
     if city == "SP":
         # Pool de IDs únicos de entregas (1 a 25)
         delivery_ids = list(range(1, 26))
-        random.shuffle(delivery_ids)
+        rng.shuffle(delivery_ids)
         
         # Distribui aleatoriamente em 5 veículos com 5 entregas cada
         return {
@@ -0,0 +1,99 @@
+from functools import cached_property
+from pathlib import Path
+import json
+import numpy as np
+import _kernels
+
+class DistanceMatrix:
+    """
+    Array-backed (N+1)x(N+1) distance matrix indexed by delivery ID, with the depot at index 0.
+
+    `matrix` keeps the NumPy array for vectorized code and the compiled kernels, while `rows`
+    mirrors it as nested lists so the pure-Python hot loops avoid NumPy scalar indexing
+    overhead. The mirror is built on first use only (about 4x the array's memory).
+
+    A matrix loaded with load_distance_matrix keeps its file `path`: the array is a read-only
+    memory map, and pickling (e.g. for worker processes) sends the path instead of the data.
+    """
+    def __init__(self, matrix: np.ndarray, path: str | Path = None):
+        self.matrix = np.ascontiguousarray(matrix, dtype=np.float64)
+        self.path = path
+
+    def __getstate__(self) -> dict[str, any]:
+        state = {key: value for key, value in self.__dict__.items() if key != 'rows'}
+        if self.path is not None:
+            del state['matrix']
+        return state
+
+    def __setstate__(self, state: dict[str, any]):
+        self.__dict__.update(state)
+        if 'matrix' not in state:
+            self.matrix = np.load(self.path, mmap_mode="r")
+
+    @cached_property
+    def rows(self) -> list[list[float]]:
+        return self.matrix.tolist()
+
+    def __len__(self) -> int:
+        return len(self.matrix)
+
+    def distance(self, a: int, b: int) -> float:
+        return self.rows[a][b]
+
+    def path_cost(self, path: list[int]) -> float:
+        # Open path: sum of consecutive legs, no depot
+        if _kernels.accel is not None:
+            return _kernels.accel.path_cost(self.matrix, path)
+        rows = self.rows
+        cost = 0
+        for k in range(len(path) - 1):
+            cost += rows[path[k]][path[k + 1]]
+        return cost
+
+    def route_distance(self, route: list[int]) -> float:
+        # Closed route: depot -> deliveries -> depot
+        if _kernels.accel is not None:
+            return _kernels.accel.route_distance(self.matrix, route)
+        rows = self.rows
+        distance = rows[0][route[0]]
+        for k in range(len(route) - 1):
+            distance += rows[route[k]][route[k + 1]]
+        distance += rows[route[-1]][0]
+        return distance
+
+def manhattan_matrix(lat: list[float], lon: list[float]) -> DistanceMatrix:
+    """Build the Manhattan matrix over points already ordered by delivery ID (depot at index 0)."""
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    # In-place accumulation: one temporary (N+1)x(N+1) array instead of four
+    matrix = np.subtract.outer(lat, lat)
+    np.abs(matrix, out=matrix)
+    lon_diff = np.subtract.outer(lon, lon)
+    np.abs(lon_diff, out=lon_diff)
+    matrix += lon_diff
+    return DistanceMatrix(matrix)
+
+def save_distance_matrix(path: str | Path, matrix: np.ndarray, metadata: dict[str, any]):
+    """
+    Write a precomputed matrix as a float64 .npy file (memory-mappable) plus a JSON sidecar
+    (same name, .json) with `metadata`, which must include the `points` [[lat, lon], ...]
+    the rows refer to, in delivery ID order with the depot first.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.save(path, np.ascontiguousarray(matrix, dtype=np.float64))
+    path.with_suffix(".json").write_text(json.dumps(metadata, indent=2), encoding="utf-8")
+
+def load_distance_matrix(path: str | Path) -> tuple[DistanceMatrix, dict[str, any]]:
+    """Memory-map a matrix written by save_distance_matrix; returns it with its metadata."""
+    path = Path(path)
+    metadata = json.loads(path.with_suffix(".json").read_text(encoding="utf-8"))
+    matrix = np.load(path, mmap_mode="r")
+    if matrix.dtype != np.float64 or matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+        raise ValueError(f"{path} is not a square float64 distance matrix.")
+    return DistanceMatrix(matrix, path=str(path)), metadata
+
+if __name__ == "__main__":
+    dm = manhattan_matrix([0, 1, 4, 7], [0, 2, 6, 8])
+    print(dm.matrix)
+    print(f"Total Manhattan Distance of the route: {dm.route_distance([1, 2, 3])}")
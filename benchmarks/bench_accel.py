@@ -0,0 +1,93 @@
+"""
+Paridade e benchmark: kernels compilados (_accel, C API) vs. fallback em Python puro
+
+Compile antes com `python setup.py build_ext --inplace`. O script confere que os dois
+backends produzem exatamente os mesmos valores (distâncias, divisão em rotas, penalidades,
+fitness e filhos do BCRC) e depois mede o tempo de cada um.
+"""
+import sys
+import random
+import timeit
+from pathlib import Path
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import _kernels
+from _encode_decode import decode_chromosome, split_routes, validate_chromosome
+from c_fitness import calculate_fitness, route_fitness
+from d_crossover import BCRC
+from delivery_setup.problem_instance import load_problem_instance, synthetic_problem_instance
+
+BACKENDS = ("python", "c")
+
+def backend_outputs(backend: str, instance, chromosomes: list[list[int]], seed: int) -> list:
+    _kernels.set_backend(backend)
+    dm = instance.distance_matrix
+    outputs = []
+
+    for chromosome in chromosomes:
+        outputs.append(dm.route_distance(chromosome[:7]))
+        outputs.append(dm.path_cost(chromosome))
+        routes = decode_chromosome(chromosome, instance)
+        outputs.append(routes)
+        outputs.append([route_fitness(i, v, route, instance) for i, (v, route) in enumerate(routes)])
+        outputs.append(calculate_fitness(routes, instance))
+
+        # Split resumed mid-round (as done by c_delta_fitness)
+        half = chromosome[len(chromosome) // 2:]
+        outputs.append(split_routes(list(half), instance, start_slot=len(instance.vehicle_ids) + 1, routes_created=True))
+
+    random.seed(seed)
+    for parent1, parent2 in zip(chromosomes, chromosomes[1:]):
+        child = BCRC(parent1, parent2, instance)
+        validate_chromosome(child, instance.n_deliveries)
+        outputs.append(child)
+
+    return outputs
+
+def check_parity(instance, n_chromosomes: int = 20, seed: int = 0):
+    rng = random.Random(seed)
+    chromosomes = [rng.sample(instance.delivery_ids, instance.n_deliveries) for _ in range(n_chromosomes)]
+    expected, accelerated = (backend_outputs(backend, instance, chromosomes, seed) for backend in BACKENDS)
+    assert expected == accelerated, f"Backends diverged on {instance.city}"
+
+def time_backend(backend: str, instance, chromosomes: list[list[int]], number: int) -> dict[str, float]:
+    _kernels.set_backend(backend)
+    pairs = list(zip(chromosomes, chromosomes[1:]))
+    splits = [decode_chromosome(c, instance) for c in chromosomes]
+
+    def best(fn, count):
+        return min(timeit.repeat(fn, number=number, repeat=3)) / (number * count)
+
+    return {
+        "decode": best(lambda: [decode_chromosome(c, instance) for c in chromosomes], len(chromosomes)),
+        "fitness": best(lambda: [calculate_fitness(r, instance) for r in splits], len(splits)),
+        "BCRC": best(lambda: [BCRC(p1, p2, instance) for p1, p2 in pairs], len(pairs))
+    }
+
+def run_benchmark(sizes: tuple[int, ...] = (25, 500, 5000), n_vehicles: int = 5, seed: int = 0):
+    if _kernels._accel is None:
+        print("Extensão _accel não compilada: execute `python setup.py build_ext --inplace`.")
+        return
+
+    check_parity(load_problem_instance("SP"), seed=seed)
+    for n in sizes:
+        check_parity(synthetic_problem_instance(n, n_vehicles, seed=n), n_chromosomes=4 if n >= 1000 else 20, seed=seed)
+    print("Paridade: OK (python == c)\n")
+
+    print(f"=== KERNELS COMPILADOS ({n_vehicles} veículos) ===\n")
+    print(f"{'entregas':>8s} | {'etapa':>8s} | {'python':>12s} | {'c':>12s} | {'speedup':>8s}")
+
+    for n in sizes:
+        instance = synthetic_problem_instance(n, n_vehicles, seed=n)
+        chromosomes = [random.sample(instance.delivery_ids, n) for _ in range(5)]
+        number = max(1, 500 // n)
+        py, c = (time_backend(backend, instance, chromosomes, number) for backend in BACKENDS)
+        for step in py:
+            print(f"{n:8d} | {step:>8s} | {py[step] * 1e3:9.3f} ms | {c[step] * 1e3:9.3f} ms | {py[step] / c[step]:7.2f}x")
+
+    _kernels.set_backend("c")
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,75 @@
+"""
+Benchmark: RBX/BCRC em O(n) (vetor de pertinência, somas de pernas da base) vs. versões anteriores
+"""
+import sys
+import random
+import timeit
+from pathlib import Path
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from _encode_decode import decode_chromosome, validate_chromosome
+from d_crossover import RBX, BCRC
+from delivery_setup.problem_instance import synthetic_problem_instance
+
+def list_scan_RBX(parent1, parent2, instance):
+    # Implementação anterior: decodifica parent1 e usa `gene not in child`
+    routes_p1 = dict(decode_chromosome(parent1, instance))
+    selected_vehicle = random.choice(list(routes_p1.keys()))
+    child = list(routes_p1[selected_vehicle])
+    for gene in parent2:
+        if gene not in child:
+            child.append(gene)
+    return child
+
+def list_scan_BCRC(parent1, parent2, instance):
+    # Implementação anterior: filtro `g not in subroute`
+    path_cost = instance.distance_matrix.path_cost
+    i, j = sorted(random.sample(range(len(parent1)), 2))
+    subroute = parent1[i:j]
+    base = [g for g in parent2 if g not in subroute]
+
+    best_pos = 0
+    best_cost = float("inf")
+    for pos in range(len(base) + 1):
+        cost = path_cost(base[:pos] + subroute + base[pos:])
+        if cost < best_cost:
+            best_cost = cost
+            best_pos = pos
+    return base[:best_pos] + subroute + base[best_pos:]
+
+def time_operator(operator, pairs, instance, number: int) -> float:
+    return min(timeit.repeat(lambda: [operator(p1, p2, instance) for p1, p2 in pairs], number=number, repeat=3)) / (number * len(pairs))
+
+def run_benchmark(sizes: tuple[int, ...] = (25, 500, 5000), n_vehicles: int = 5, n_pairs: int = 4, seed: int = 0):
+    print(f"=== CROSSOVER BENCHMARK ({n_vehicles} veículos) ===\n")
+    print(f"{'entregas':>8s} | {'operador':>8s} | {'anterior':>12s} | {'O(n)':>12s} | {'speedup':>8s}")
+
+    for n in sizes:
+        instance = synthetic_problem_instance(n, n_vehicles, seed=n)
+        pairs = [(random.sample(instance.delivery_ids, n), random.sample(instance.delivery_ids, n)) for _ in range(n_pairs)]
+        splits = [decode_chromosome(p1, instance) for p1, _ in pairs]
+
+        # Same children for the same seed, and valid permutations
+        for (p1, p2), routes in zip(pairs, splits):
+            for old, new in ((list_scan_RBX, lambda a, b, inst, r=routes: RBX(a, b, inst, routes_p1=r)), (list_scan_BCRC, BCRC)):
+                random.seed(seed)
+                expected = old(p1, p2, instance)
+                random.seed(seed)
+                child = new(p1, p2, instance)
+                assert child == expected
+                validate_chromosome(child, n)
+
+        number = max(1, 500 // n)
+        rbx_pairs = list(zip(pairs, splits))
+        t_old = time_operator(list_scan_RBX, pairs, instance, number)
+        t_new = min(timeit.repeat(lambda: [RBX(p1, p2, instance, routes_p1=r) for (p1, p2), r in rbx_pairs], number=number, repeat=3)) / (number * n_pairs)
+        print(f"{n:8d} | {'RBX':>8s} | {t_old * 1e3:9.3f} ms | {t_new * 1e3:9.3f} ms | {t_old / t_new:7.2f}x")
+
+        t_old = time_operator(list_scan_BCRC, pairs, instance, number)
+        t_new = time_operator(BCRC, pairs, instance, number)
+        print(f"{n:8d} | {'BCRC':>8s} | {t_old * 1e3:9.3f} ms | {t_new * 1e3:9.3f} ms | {t_old / t_new:7.2f}x")
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,70 @@
+"""
+Benchmark: decode_chromosome linear (compactação em uma passada) vs. versão anterior com list.remove
+"""
+import sys
+import random
+import timeit
+from pathlib import Path
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from _encode_decode import decode_chromosome
+from delivery_setup.problem_instance import synthetic_problem_instance
+
+def list_remove_decode(chromosome, instance) -> list[tuple[str, tuple[int]]]:
+    # Implementação anterior (quadrática), mantida como referência
+    all_routes = []
+    remaining_deliveries = list(chromosome)
+
+    while remaining_deliveries:
+        routes_created = False
+
+        for v, capacity in zip(instance.vehicle_ids, instance.capacity):
+            if not remaining_deliveries:
+                break
+
+            current_route = []
+            current_load = 0
+            deliveries_to_remove = []
+
+            for gene in remaining_deliveries:
+                demand = instance.demand[gene]
+                if current_load + demand <= capacity:
+                    current_route.append(gene)
+                    current_load += demand
+                    deliveries_to_remove.append(gene)
+
+            for gene in deliveries_to_remove:
+                remaining_deliveries.remove(gene)
+
+            if current_route:
+                all_routes.append((v, tuple(current_route)))
+                routes_created = True
+
+        if not routes_created:
+            break
+
+    return all_routes
+
+def run_benchmark(sizes: tuple[int, ...] = (25, 100, 500, 1000, 2500, 5000), n_vehicles: int = 5, samples: int = 5):
+    print(f"=== DECODE BENCHMARK ({n_vehicles} veículos) ===\n")
+    print(f"{'entregas':>8s} | {'list.remove':>12s} | {'linear':>12s} | {'speedup':>8s}")
+
+    for n in sizes:
+        instance = synthetic_problem_instance(n, n_vehicles, seed=n)
+        chromosomes = [random.sample(instance.delivery_ids, n) for _ in range(samples)]
+
+        # Same routes, gene by gene
+        for chromosome in chromosomes:
+            assert list_remove_decode(chromosome, instance) == decode_chromosome(chromosome, instance)
+
+        number = max(1, 2000 // n)
+        t_old = min(timeit.repeat(lambda: [list_remove_decode(c, instance) for c in chromosomes], number=number, repeat=3))
+        t_new = min(timeit.repeat(lambda: [decode_chromosome(c, instance) for c in chromosomes], number=number, repeat=3))
+        t_old /= number * samples
+        t_new /= number * samples
+        print(f"{n:8d} | {t_old * 1e3:9.3f} ms | {t_new * 1e3:9.3f} ms | {t_old / t_new:7.2f}x")
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,138 @@
+"""
+Benchmark: busca das rotas (Directions API) sequencial vs. concorrente, contra um servidor local
+
+Um servidor HTTP local imita a Directions API com latência fixa e falhas transitórias
+(UNKNOWN_ERROR, OVER_QUERY_LIMIT ou HTTP 503 na primeira tentativa de algumas rotas), então
+o benchmark roda sem rede e sem chave de API. Compara uma requisição por vez (como o laço
+antigo de run.py) com o DirectionsFetcher (threads, limite de taxa e retentativas), confere que
+as respostas são iguais e que o servidor recebe exatamente uma chamada por tentativa do fetcher
+(as retentativas internas do googlemaps.Client ficam desligadas).
+"""
+import os
+import sys
+import json
+import time
+import random
+import tempfile
+import threading
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import polyline
+from itinerary_routes.a_google_maps import GoogleMapsAPI
+from itinerary_routes.e_directions_fetcher import DirectionsFetcher
+
+def parse_point(text: str) -> tuple[float, float]:
+    lat, lon = text.split(",")
+    return float(lat), float(lon)
+
+def stub_directions(origin: tuple[float, float], destination: tuple[float, float], waypoints: list[tuple[float, float]]) -> dict:
+    """Directions-shaped response: one leg per stop, each a single straight step."""
+    stops = [origin, *waypoints, destination]
+    legs = [
+        {
+            'start_location': {'lat': a[0], 'lng': a[1]},
+            'end_location': {'lat': b[0], 'lng': b[1]},
+            'steps': [{'polyline': {'points': polyline.encode([a, ((a[0] + b[0]) / 2, (a[1] + b[1]) / 2), b])}}]
+        }
+        for a, b in zip(stops, stops[1:])
+    ]
+    return {'status': 'OK', 'routes': [{'legs': legs}]}
+
+class StubDirectionsHandler(BaseHTTPRequestHandler):
+    latency = 0.2
+    flaky_every = 4     # cada 4ª rota falha na primeira tentativa
+    failures = ("UNKNOWN_ERROR", "OVER_QUERY_LIMIT", 503)
+    seen = set()
+    hits = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        origin, destination = parse_point(query['origin'][0]), parse_point(query['destination'][0])
+        waypoints = [parse_point(p) for p in query['waypoints'][0].split("|")] if 'waypoints' in query else []
+        time.sleep(self.latency)
+
+        with self.lock:
+            first_attempt = query['waypoints'][0] not in self.seen
+            self.seen.add(query['waypoints'][0])
+            StubDirectionsHandler.hits += 1
+        status = 200
+        if first_attempt and hash(query['waypoints'][0]) % self.flaky_every == 0:
+            failure = self.failures[hash(query['waypoints'][0]) // self.flaky_every % len(self.failures)]
+            if failure == 503:
+                status, body = 503, {}
+            else:
+                body = {'status': failure, 'routes': []}
+        else:
+            body = stub_directions(origin, destination, waypoints)
+
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+def route_requests(n_routes: int, stops: int, seed: int = 0) -> list[dict[str, any]]:
+    rng = random.Random(seed)
+    depot = (-23.5505, -46.6333)
+    return [
+        {
+            'origin': depot,
+            'destination': depot,
+            'waypoints': [(round(-23.6 + rng.random() * 0.2, 6), round(-46.75 + rng.random() * 0.25, 6)) for _ in range(stops)],
+            'route_id': index
+        }
+        for index in range(n_routes)
+    ]
+
+def run_benchmark(n_routes: int = 24, stops: int = 8, latency: float = 0.2, workers: int = 8):
+    StubDirectionsHandler.latency = latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubDirectionsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    os.environ["GOOGLE_MAPS_API_KEY"] = "AIzaStubKeyForLocalServer"  # Nunca sai da máquina local
+    requests = route_requests(n_routes, stops)
+
+    print(f"=== DIRECTIONS: SEQUENCIAL vs. CONCORRENTE ({n_routes} rotas, {stops} paradas, latência {latency * 1e3:.0f} ms) ===\n")
+    results = {}
+    for name, max_workers in (("sequencial", 1), (f"concorrente ({workers})", workers)):
+        StubDirectionsHandler.seen = set()
+        StubDirectionsHandler.hits = 0
+        api = GoogleMapsAPI(cache_path=None, base_url=base_url)
+        fetcher = DirectionsFetcher(api, max_workers=max_workers, requests_per_second=50, backoff=0.05)
+        start = time.perf_counter()
+        first = None
+        fetched = {}
+        for request, directions in fetcher.fetch_all(requests):
+            first = first if first is not None else time.perf_counter() - start
+            fetched[request['route_id']] = directions
+        elapsed = time.perf_counter() - start
+        results[name] = fetched
+        print(f"{name:>18s} | total {elapsed:6.2f}s | primeira rota em {first:5.2f}s | retentativas {fetcher.retried:2d} | falhas {len(fetcher.failures)}")
+        assert StubDirectionsHandler.hits == n_routes + fetcher.retried, "o cliente repetiu requisições por conta própria"
+
+    sequential, concurrent = results.values()
+    assert sequential == concurrent and len(sequential) == n_routes, "respostas diferentes entre as estratégias"
+
+    # Segunda passada pelo cache persistente, em modo offline (sem servidor)
+    cache_path = Path(tempfile.mkdtemp()) / "directions.sqlite"
+    online = GoogleMapsAPI(cache_path=cache_path, base_url=base_url)
+    list(DirectionsFetcher(online, max_workers=workers, requests_per_second=50, backoff=0.05).fetch_all(requests))
+    server.shutdown()
+
+    start = time.perf_counter()
+    offline = dict((r['route_id'], d) for r, d in DirectionsFetcher(GoogleMapsAPI(cache_path=cache_path, offline=True)).fetch_all(requests))
+    print(f"{'cache offline':>18s} | total {time.perf_counter() - start:6.2f}s | {len(offline)} rotas")
+    assert offline == sequential
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,62 @@
+"""
+Benchmark: distância Manhattan por tuplas (lat, lon) vs. matriz de distâncias pré-computada
+"""
+import sys
+import random
+import timeit
+from pathlib import Path
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from b_manhattan_distance import route_distance, cartesian_to_manhattan
+from _encode_decode import decode_chromosome
+from delivery_setup.problem_instance import load_problem_instance
+
+def tuple_route_distances(routes, instance) -> float:
+    # Caminho antigo: monta as tuplas de coordenadas a cada avaliação
+    total = 0
+    for _, route in routes:
+        list_coords = [(instance.deliveries[d]['lat'], instance.deliveries[d]['lon']) for d in route]
+        total += route_distance(list_coords, center_coords=instance.depot)
+    return total
+
+def matrix_route_distances(routes, instance) -> float:
+    route_dist = instance.distance_matrix.route_distance
+    total = 0
+    for _, route in routes:
+        total += route_dist(route)
+    return total
+
+def tuple_path_cost(path, instance) -> float:
+    dd = instance.deliveries
+    cost = 0
+    for k in range(len(path) - 1):
+        a, b = path[k], path[k + 1]
+        cost += cartesian_to_manhattan((dd[a]["lat"], dd[a]["lon"]), (dd[b]["lat"], dd[b]["lon"]))
+    return cost
+
+def run_benchmark(city: str = "SP", n_individuals: int = 300, repeat: int = 5):
+    instance = load_problem_instance(city)
+    chromosomes = [random.sample(instance.delivery_ids, instance.n_deliveries) for _ in range(n_individuals)]
+    decoded = [decode_chromosome(c, instance) for c in chromosomes]
+
+    # Sanity check: both paths must agree exactly
+    for routes in decoded:
+        assert tuple_route_distances(routes, instance) == matrix_route_distances(routes, instance)
+
+    cases = (
+        ("route distance", lambda: [tuple_route_distances(r, instance) for r in decoded],
+                           lambda: [matrix_route_distances(r, instance) for r in decoded]),
+        ("BCRC path cost", lambda: [tuple_path_cost(c, instance) for c in chromosomes],
+                           lambda: [instance.distance_matrix.path_cost(c) for c in chromosomes]),
+    )
+
+    print(f"=== DISTANCE MATRIX BENCHMARK ({city}, {n_individuals} indivíduos) ===\n")
+    for name, old, new in cases:
+        t_old = min(timeit.repeat(old, number=1, repeat=repeat)) / n_individuals
+        t_new = min(timeit.repeat(new, number=1, repeat=repeat)) / n_individuals
+        print(f"{name:16s}: tuplas {t_old * 1e6:8.2f} us/aval | matriz {t_new * 1e6:8.2f} us/aval | speedup {t_old / t_new:5.2f}x")
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,63 @@
+"""
+Benchmark: modelo de ilhas com migração vs. reinícios independentes (mesmo orçamento de gerações)
+
+As duas estratégias usam as mesmas configurações de regime e sementes; a diferença é a troca
+dos melhores cromossomos entre as ilhas a cada `migration_interval` gerações.
+"""
+import os
+import sys
+import io
+import time
+import random
+import tempfile
+import contextlib
+from pathlib import Path
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import matplotlib
+matplotlib.use("Agg")
+
+from h_island_model import IslandModel, RING, RANDOM
+
+REGIMES = (  # (population_length, ratio_elitism, ratio_mutation, tournament_k) dos regimes A, B e C de run.py
+    (350, 0.02, 0.30, 2), (300, 0.03, 0.18, 3), (260, 0.05, 0.10, 4),
+    (380, 0.02, 0.28, 2), (320, 0.03, 0.20, 3), (240, 0.05, 0.12, 4)
+)
+
+def islands_params(max_generations: int, population_scale: float) -> list[dict[str, any]]:
+    return [
+        dict(city_code="SP", population_length=int(pop * population_scale), max_generations=max_generations,
+             ratio_elitism=elitism, ratio_mutation=mutation, tournament_k=k)
+        for pop, elitism, mutation, k in REGIMES
+    ]
+
+def run_strategy(migration_interval: int, topology: str, max_generations: int, population_scale: float, workers: int, seed: int) -> tuple[float, float]:
+    random.seed(seed)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = IslandModel(islands_params(max_generations, population_scale), migration_interval, 2, topology, workers).run()
+    return min(result['fitness'] for result in results), time.perf_counter() - start
+
+def run_benchmark(max_generations: int = 300, population_scale: float = 0.25, seeds: tuple[int, ...] = (0, 1, 2), workers: int = os.cpu_count()):
+    # Os gráficos de evolução das ilhas vão para um diretório temporário
+    os.chdir(tempfile.mkdtemp())
+    os.mkdir("fitness_balance")
+
+    print(f"=== ILHAS vs. REINÍCIOS INDEPENDENTES ({len(REGIMES)} ilhas, {max_generations} gerações, {workers} processos) ===\n")
+    print(f"{'estratégia':>22s} | {'melhor fitness (média)':>22s} | {'tempo':>8s}")
+
+    strategies = (
+        ("independentes", max_generations, RING),  # sem migração: intervalo maior que a execução
+        ("ilhas (anel, 25)", 25, RING),
+        ("ilhas (aleatória, 25)", 25, RANDOM)
+    )
+    for name, interval, topology in strategies:
+        runs = [run_strategy(interval, topology, max_generations, population_scale, workers, seed) for seed in seeds]
+        best = sum(fitness for fitness, _ in runs) / len(runs)
+        elapsed = sum(t for _, t in runs) / len(runs)
+        print(f"{name:>22s} | {best:22.2f} | {elapsed:7.1f}s")
+
+if __name__ == "__main__":
+    run_benchmark()
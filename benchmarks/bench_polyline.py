@@ -0,0 +1,89 @@
+"""
+Benchmark: decodificação das polylines das rotas (polyline.decode + listas vs. NumPy vetorizado)
+
+Gera respostas no formato da Directions API com muitas pernas/passos, confere que o
+PolylineDesigner vetorizado devolve exatamente os mesmos pontos que a implementação anterior
+(polyline.decode por passo, listas de tuplas) e mede decodificação + preparação das
+coordenadas (lon, lat) para o StaticMapRoute.
+"""
+import sys
+import random
+import timeit
+from pathlib import Path
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import polyline
+from itinerary_routes.b_polyline_designer import PolylineDesigner
+
+def synthetic_directions(n_legs: int, steps_per_leg: int, points_per_step: int, seed: int = 0) -> list[dict]:
+    """Directions-shaped response; consecutive steps share their junction point, like the real API."""
+    rng = random.Random(seed)
+    lat, lon = -23.55, -46.63
+    legs = []
+    for _ in range(n_legs):
+        start = (lat, lon)
+        steps = []
+        for _ in range(steps_per_leg):
+            points = [(lat, lon)]
+            for _ in range(points_per_step - 1):
+                lat = round(lat + rng.uniform(-5e-4, 5e-4), 5)
+                lon = round(lon + rng.uniform(-5e-4, 5e-4), 5)
+                points.append((lat, lon))
+            steps.append({'polyline': {'points': polyline.encode(points)}})
+        legs.append({'start_location': {'lat': start[0], 'lng': start[1]}, 'end_location': {'lat': lat, 'lng': lon}, 'steps': steps})
+    return [{'legs': legs}]
+
+def legacy_multicolors(directions: list[dict]) -> list[list[tuple[float, float]]]:
+    """Implementação anterior de extract_coordinates_with_multicolors (sem os pontos de início)."""
+    legs_coords = []
+    for leg in directions[0]['legs']:
+        leg_coords = []
+        for step in leg['steps']:
+            decoded = polyline.decode(step['polyline']['points'])
+            if leg_coords and decoded[0] == leg_coords[-1]:
+                decoded = decoded[1:]
+            leg_coords.extend(decoded)
+        legs_coords.append(leg_coords)
+    return legs_coords
+
+def legacy_onecolor(directions: list[dict]) -> list[tuple[float, float]]:
+    coords = []
+    for leg in directions[0]['legs']:
+        for step in leg['steps']:
+            decoded = polyline.decode(step['polyline']['points'])
+            if coords and decoded[0] == coords[-1]:
+                decoded = decoded[1:]
+            coords.extend(decoded)
+    return coords
+
+def legacy_pipeline(directions: list[dict]) -> list[list[tuple[float, float]]]:
+    # Decodificação + inversão (lat, lon) -> (lon, lat) feita pelo StaticMapRoute
+    return [[(lon, lat) for lat, lon in leg] for leg in legacy_multicolors(directions)]
+
+def vectorized_pipeline(directions: list[dict]) -> list[list[list[float]]]:
+    legs, _ = PolylineDesigner(directions).extract_coordinates_with_multicolors()
+    return [leg[:, ::-1].tolist() for leg in legs]
+
+def run_benchmark(cases: tuple[tuple[int, int, int], ...] = ((5, 10, 10), (20, 30, 20), (40, 60, 40)), repeat: int = 5):
+    print("=== POLYLINES: polyline.decode + listas vs. NumPy vetorizado ===\n")
+    print(f"{'pernas x passos x pontos':>26s} | {'pontos':>8s} | {'anterior':>10s} | {'vetorizado':>10s} | speedup")
+    for n_legs, steps, points in cases:
+        directions = synthetic_directions(n_legs, steps, points)
+        designer = PolylineDesigner(directions)
+
+        legs, _ = designer.extract_coordinates_with_multicolors()
+        assert [leg.tolist() for leg in legs] == [[list(p) for p in leg] for leg in legacy_multicolors(directions)], "pernas diferentes"
+        route, _ = designer.extract_coordinates_with_onecolor()
+        assert route.tolist() == [list(p) for p in legacy_onecolor(directions)], "rota única diferente"
+        assert vectorized_pipeline(directions) == [[list(p) for p in leg] for leg in legacy_pipeline(directions)]
+
+        number = 20
+        legacy = min(timeit.repeat(lambda: legacy_pipeline(directions), number=number, repeat=repeat)) / number
+        vectorized = min(timeit.repeat(lambda: vectorized_pipeline(directions), number=number, repeat=repeat)) / number
+        total = sum(len(leg) for leg in legs)
+        print(f"{f'{n_legs} x {steps} x {points}':>26s} | {total:8d} | {legacy * 1e3:7.2f} ms | {vectorized * 1e3:7.2f} ms | {legacy / vectorized:5.1f}x")
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,59 @@
+"""
+Benchmark: custo do PhaseProfiler e divisão do tempo de cada geração por fase
+
+Executa o AG com a mesma semente sem e com o profiler, confere que a evolução é idêntica,
+mostra o custo da instrumentação e a participação de cada fase (avaliação, estatísticas,
+seleção, crossover, mutação). Uma janela de gerações é gravada em pstats via cProfile.
+"""
+import os
+import sys
+import io
+import time
+import pstats
+import tempfile
+import contextlib
+from pathlib import Path
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import matplotlib
+matplotlib.use("Agg")
+
+from genetic_algorithm import GeneticAlgorithm
+from _profiling import PhaseProfiler
+
+def run_ga(max_generations: int, population_length: int, profiler: PhaseProfiler = None, seed: int = 0) -> tuple[GeneticAlgorithm, float]:
+    ga = GeneticAlgorithm("SP", max_generations, population_length, 0.05, 0.3, 3, seed=seed, profiler=profiler)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ga.run(iterator=0)
+    return ga, time.perf_counter() - start
+
+def run_benchmark(max_generations: int = 300, population_length: int = 200, repeat: int = 3):
+    # O gráfico de evolução e o arquivo pstats vão para um diretório temporário
+    os.chdir(tempfile.mkdtemp())
+    os.mkdir("fitness_balance")
+    window = (max_generations // 2, max_generations // 2 + 9)
+
+    print(f"=== PROFILER POR FASE (SP, população {population_length}, {max_generations} gerações) ===\n")
+    plain = min(run_ga(max_generations, population_length)[1] for _ in range(repeat))
+    profiled_runs = [run_ga(max_generations, population_length, PhaseProfiler(cprofile_window=window)) for _ in range(repeat)]
+    profiled = min(elapsed for _, elapsed in profiled_runs)
+    ga = profiled_runs[0][0]
+
+    reference, _ = run_ga(max_generations, population_length)
+    assert ga.fitness_history == reference.fitness_history, "o profiler alterou a evolução"
+
+    print(f"sem profiler:  {plain:7.2f}s")
+    print(f"com profiler:  {profiled:7.2f}s  ({profiled / plain - 1:+.1%}, inclui cProfile nas gerações {window[0]}-{window[1]})\n")
+
+    print(f"{'fase':>12s} | {'tempo':>8s} | participação")
+    for phase, stats in ga.profiler.summary().items():
+        print(f"{phase:>12s} | {stats['seconds']:7.3f}s | {stats['share']:6.1%}")
+
+    print(f"\nFunções mais custosas nas gerações {window[0]}-{window[1]} ({ga.profiler.cprofile_path}):")
+    pstats.Stats(ga.profiler.cprofile_path).sort_stats("cumulative").print_stats(8)
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,114 @@
+"""
+Benchmark: renderização dos PNGs das rotas com e sem o cache local de tiles, contra um servidor local
+
+Um servidor HTTP local imita o servidor de tiles do OpenStreetMap (PNGs gerados com PIL e
+latência fixa), então o benchmark roda sem rede. Renderiza as rotas de uma varredura com o
+StaticMap puro (cada tile baixado de novo a cada mapa), com o cache frio (cada tile baixado uma
+vez), com o cache quente (só disco) e em modo offline com o servidor desligado, e confere que as
+imagens são idênticas.
+"""
+import sys
+import time
+import random
+import tempfile
+import threading
+from io import BytesIO
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from PIL import Image, ImageDraw
+from staticmap import StaticMap, Line, CircleMarker
+from itinerary_routes._tile_cache import TileCache, CachedStaticMap
+
+def stub_tile(z: int, x: int, y: int) -> bytes:
+    """Tile determinístico: cor derivada de z/x/y e o endereço escrito nele."""
+    image = Image.new("RGB", (256, 256), ((x * 37) % 256, (y * 61) % 256, (z * 17) % 256))
+    ImageDraw.Draw(image).text((8, 8), f"{z}/{x}/{y}", fill="white")
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+class StubTileHandler(BaseHTTPRequestHandler):
+    latency = 0.05
+    served = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        z, x, y = (int(part) for part in self.path.removesuffix(".png").strip("/").split("/"))
+        time.sleep(self.latency)
+        with self.lock:
+            StubTileHandler.served += 1
+
+        payload = stub_tile(z, x, y)
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+def synthetic_routes(n_routes: int, stops: int, seed: int = 0) -> list[list[tuple[float, float]]]:
+    """Rotas (lon, lat) saindo e voltando ao depósito, todas na mesma região da cidade."""
+    rng = random.Random(seed)
+    depot = (-46.6333, -23.5505)
+    return [
+        [depot, *[(-46.75 + rng.random() * 0.25, -23.6 + rng.random() * 0.2) for _ in range(stops)], depot]
+        for _ in range(n_routes)
+    ]
+
+def render_routes(routes: list[list[tuple[float, float]]], tile_cache: TileCache | None, url_template: str, output_dir: Path) -> list[bytes]:
+    """Mesmo desenho do StaticMapRoute (1200x800, linha e marcadores por parada); sem tile_cache usa o StaticMap puro."""
+    images = []
+    for index, route in enumerate(routes):
+        if tile_cache is None:
+            map_image = StaticMap(1200, 800, url_template=url_template)
+        else:
+            map_image = CachedStaticMap(1200, 800, tile_cache, url_template=url_template)
+        map_image.add_line(Line(route, 'blue', 3))
+        for point in route[:-1]:
+            map_image.add_marker(CircleMarker(point, 'red', 10))
+        png_path = output_dir / f"route_{index}.png"
+        map_image.render().save(png_path)
+        images.append(png_path.read_bytes())
+    return images
+
+def run_benchmark(n_routes: int = 12, stops: int = 8, latency: float = 0.05):
+    StubTileHandler.latency = latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubTileHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url_template = f"http://127.0.0.1:{server.server_port}/{{z}}/{{x}}/{{y}}.png"
+    routes = synthetic_routes(n_routes, stops)
+    work_dir = Path(tempfile.mkdtemp())
+    cache_dir = work_dir / "tiles"
+
+    print(f"=== TILES: SEM CACHE vs. CACHE FRIO vs. QUENTE vs. OFFLINE ({n_routes} mapas, latência {latency * 1e3:.0f} ms por tile) ===\n")
+    results = {}
+    for name, cached, offline in (("sem cache", False, False), ("cache frio", True, False), ("cache quente", True, False), ("offline", True, True)):
+        if offline:
+            server.shutdown()
+        StubTileHandler.served = 0
+        tile_cache = TileCache(cache_dir, offline=offline) if cached else None
+        output_dir = work_dir / name.replace(" ", "_")
+        output_dir.mkdir()
+
+        start = time.perf_counter()
+        results[name] = render_routes(routes, tile_cache, url_template, output_dir)
+        elapsed = time.perf_counter() - start
+        counters = f"do disco {tile_cache.hits:4d} | baixados {tile_cache.downloads:4d} | " if cached else " " * 33
+        print(f"{name:>13s} | total {elapsed:6.2f}s | {elapsed / n_routes * 1e3:7.1f} ms/mapa | {counters}servidor {StubTileHandler.served:4d}")
+
+    assert len(set(map(tuple, results.values()))) == 1, "imagens diferentes entre as passadas"
+
+    # Limite de tamanho: com max_bytes pequeno os tiles menos usados são removidos
+    capped = TileCache(cache_dir, max_bytes=tile_cache.total_bytes // 2, offline=True)
+    capped.put(capped.tile_path(url_template, 0, 0, 0), stub_tile(0, 0, 0))
+    print(f"\n{'limite':>13s} | {tile_cache.total_bytes / 1024:.0f} KiB -> {capped.total_bytes / 1024:.0f} KiB (max {capped.max_bytes / 1024:.0f} KiB)")
+    assert capped.total_bytes <= capped.max_bytes
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,227 @@
+"""
+Suíte de benchmarks do pipeline do AG em instâncias sintéticas escaláveis
+
+Mede decode_chromosome, calculate_fitness, RBX, BCRC, mutação, seleção e uma geração completa
+para cada tamanho (entregas x veículos) e grava um JSON com os tempos, o commit e o ambiente,
+para comparar execuções entre commits:
+
+    python benchmarks/suite.py                                  # todos os tamanhos
+    python benchmarks/suite.py --sizes 25x5 500x20 --bench decode BCRC
+    python benchmarks/suite.py --compare benchmarks/results/<anterior>.json
+
+Com --compare, casos mais lentos que o limite (--threshold) são marcados como REGRESSÃO e o
+script termina com código 1. Instâncias acima de 5.000 entregas exigem os kernels compilados
+(`python setup.py build_ext --inplace`): sem eles, a cópia em listas da matriz não cabe na memória.
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import _kernels
+from _encode_decode import decode_chromosome
+from _population import Population
+from c_fitness import calculate_fitness
+from d_crossover import RBX, BCRC
+from f_selection import select_next_generation_indices
+from genetic_algorithm import GeneticAlgorithm
+from delivery_setup.problem_instance import synthetic_problem_instance
+
+DEFAULT_SIZES = ("25x5", "500x20", "2000x50", "10000x200")
+RESULTS_DIR = Path(__file__).parent / "results"
+PURE_PYTHON_MAX_DELIVERIES = 5000
+
+# Each benchmark: setup(instance, context) -> (callable, items per call, unit)
+def bench_decode(instance, ctx):
+    chromosomes = ctx["chromosomes"]
+    return lambda: [decode_chromosome(c, instance) for c in chromosomes], len(chromosomes), "cromossomo"
+
+def bench_fitness(instance, ctx):
+    splits = ctx["splits"]
+    return lambda: [calculate_fitness(routes, instance) for routes in splits], len(splits), "cromossomo"
+
+def bench_rbx(instance, ctx):
+    pairs, splits, rng = ctx["pairs"], ctx["splits"], random.Random(0)
+    return lambda: [RBX(p1, p2, instance, routes_p1=r, rng=rng) for (p1, p2), r in zip(pairs, splits)], len(pairs), "filho"
+
+def bench_bcrc(instance, ctx):
+    pairs, rng = ctx["pairs"], random.Random(0)
+    return lambda: [BCRC(p1, p2, instance, rng=rng) for p1, p2 in pairs], len(pairs), "filho"
+
+def bench_mutation(instance, ctx):
+    population, rng = Population(ctx["population"]), random.Random(0)
+    return lambda: population.mutate(0.3, rng), len(population), "indivíduo"
+
+def bench_selection(instance, ctx):
+    fitness, rng = ctx["fitness"], np.random.default_rng(0)
+    return lambda: select_next_generation_indices(fitness, len(fitness), 0.05, 3, rng), len(fitness), "indivíduo"
+
+def bench_generation(instance, ctx):
+    ga = GeneticAlgorithm("SP", 10**9, len(ctx["population"]), 0.05, 0.3, 3, instance=instance, seed=0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        ga.start_evolution()
+    population = Population(ctx["population"])
+    # Generation 1 avoids the progress print of generation 0
+    return lambda: ga.evolve_generation(population, 1), 1, "geração"
+
+BENCHMARKS = {
+    "decode": bench_decode,
+    "fitness": bench_fitness,
+    "RBX": bench_rbx,
+    "BCRC": bench_bcrc,
+    "mutation": bench_mutation,
+    "selection": bench_selection,
+    "generation": bench_generation
+}
+
+def parse_size(size: str) -> tuple[int, int]:
+    n_deliveries, n_vehicles = size.lower().split("x")
+    return int(n_deliveries), int(n_vehicles)
+
+def benchmark_context(instance, population_size: int, n_chromosomes: int, seed: int) -> dict[str, any]:
+    rng = random.Random(seed)
+    n = instance.n_deliveries
+    chromosomes = [rng.sample(instance.delivery_ids, n) for _ in range(n_chromosomes)]
+    splits = [decode_chromosome(c, instance) for c in chromosomes]
+    population = np.array([rng.sample(instance.delivery_ids, n) for _ in range(population_size)])
+    return {
+        "chromosomes": chromosomes,
+        "splits": splits,
+        "pairs": list(zip(chromosomes, chromosomes[1:] + chromosomes[:1])),
+        "population": population,
+        "fitness": np.array([calculate_fitness(decode_chromosome(c, instance), instance) for c in population.tolist()])
+    }
+
+def measure(fn, repeat: int, min_time: float) -> tuple[int, list[float]]:
+    """Calls per sample (timeit.autorange-style, at least `min_time` seconds) and the sample times."""
+    timer = timeit.Timer(fn)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(min_time / elapsed * 1.2))
+    return number, [elapsed] + timer.repeat(repeat=repeat - 1, number=number)
+
+def git_commit() -> tuple[str | None, bool]:
+    root = Path(__file__).parent.parent
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=root, capture_output=True, text=True, check=True).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+
+def run_suite(sizes: list[str], benchmarks: list[str], population_size: int, n_chromosomes: int, repeat: int, min_time: float, seed: int) -> dict[str, any]:
+    commit, dirty = git_commit()
+    report = {
+        "commit": commit,
+        "dirty": dirty,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "backend": _kernels.backend(),
+        "population_size": population_size,
+        "results": []
+    }
+
+    print(f"=== SUÍTE DE BENCHMARKS (backend {report['backend']}, commit {commit}{'+' if dirty else ''}) ===\n")
+    print(f"{'tamanho':>10s} | {'benchmark':>10s} | {'melhor':>12s} | {'mediana':>12s} | unidade")
+
+    for size in sizes:
+        n_deliveries, n_vehicles = parse_size(size)
+        if _kernels.accel is None and n_deliveries > PURE_PYTHON_MAX_DELIVERIES:
+            print(f"{size:>10s} | ignorado: requer os kernels compilados (python setup.py build_ext --inplace)")
+            continue
+
+        start = time.perf_counter()
+        instance = synthetic_problem_instance(n_deliveries, n_vehicles, seed=seed)
+        ctx = benchmark_context(instance, population_size, n_chromosomes, seed)
+        print(f"{size:>10s} | instância e dados preparados em {time.perf_counter() - start:.1f}s")
+
+        for name in benchmarks:
+            fn, items, unit = BENCHMARKS[name](instance, ctx)
+            number, samples = measure(fn, repeat, min_time)
+            per_item = [t / (number * items) for t in samples]
+            best, median = min(per_item), float(np.median(per_item))
+            report["results"].append({
+                "benchmark": name,
+                "n_deliveries": n_deliveries,
+                "n_vehicles": n_vehicles,
+                "unit": unit,
+                "best": best,
+                "median": median,
+                "number": number,
+                "repeat": repeat
+            })
+            print(f"{size:>10s} | {name:>10s} | {best * 1e3:9.4f} ms | {median * 1e3:9.4f} ms | por {unit}")
+
+    return report
+
+def save_report(report: dict[str, any], output: str | None) -> Path:
+    if output is None:
+        stamp = report["timestamp"].replace(":", "").replace("-", "").split("+")[0]
+        output = RESULTS_DIR / f"{stamp}_{report['commit'] or 'nocommit'}_{report['backend']}.json"
+    path = Path(output)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return path
+
+def compare_reports(baseline: dict[str, any], report: dict[str, any], threshold: float) -> list[str]:
+    """Print new/old median ratios of the cases present in both reports; returns the regressions."""
+    key = lambda r: (r["benchmark"], r["n_deliveries"], r["n_vehicles"])
+    previous = {key(r): r for r in baseline["results"]}
+    regressions = []
+
+    print(f"\n=== COMPARAÇÃO com {baseline.get('commit')} ({baseline.get('backend')}) | limite +{threshold:.0%} ===\n")
+    for result in report["results"]:
+        old = previous.get(key(result))
+        if old is None:
+            continue
+        ratio = result["median"] / old["median"]
+        case = f"{result['benchmark']} {result['n_deliveries']}x{result['n_vehicles']}"
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  <-- REGRESSÃO"
+            regressions.append(case)
+        print(f"{case:>24s} | {old['median'] * 1e3:9.4f} ms -> {result['median'] * 1e3:9.4f} ms | {ratio:5.2f}x{flag}")
+    return regressions
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks do pipeline do AG em instâncias sintéticas.")
+    parser.add_argument("--sizes", nargs="+", default=list(DEFAULT_SIZES), help="tamanhos ENTREGASxVEÍCULOS (ex.: 500x20)")
+    parser.add_argument("--bench", nargs="+", default=list(BENCHMARKS), choices=list(BENCHMARKS), help="benchmarks a executar")
+    parser.add_argument("--population", type=int, default=50, help="tamanho da população (mutação, seleção, geração)")
+    parser.add_argument("--chromosomes", type=int, default=10, help="cromossomos/pares por chamada (decode, fitness, crossover)")
+    parser.add_argument("--repeat", type=int, default=5, help="amostras por benchmark")
+    parser.add_argument("--min-time", type=float, default=0.2, help="duração mínima de cada amostra (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help=f"arquivo JSON de saída (padrão: {RESULTS_DIR.name}/<data>_<commit>_<backend>.json)")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para comparar")
+    parser.add_argument("--threshold", type=float, default=0.10, help="aumento relativo da mediana considerado regressão")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.sizes, args.bench, args.population, args.chromosomes, args.repeat, args.min_time, args.seed)
+    print(f"\nResultados salvos em {save_report(report, args.output)}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        if compare_reports(baseline, report, args.threshold):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+import numpy as np
+from c_fitness import (
+    CAPACITY_PENALTY, AUTONOMY_PENALTY, CRITICAL_WEIGHT, HIGH_PRIORITY_WEIGHT,
+    CRITICAL_POS_WEIGHT, HIGH_PRIORITY_POS_WEIGHT, COST_EFFICIENCY_THRESHOLD, COST_EFFICIENCY_WEIGHT
+)
+from delivery_setup.problem_instance import ProblemInstance, load_problem_instance
+
+class BatchFitnessEvaluator:
+    """
+    Whole-population fitness evaluation with NumPy.
+
+    Reproduces `decode_chromosome` + `calculate_fitness` for every individual at once. The
+    unassigned genes of each individual are kept compacted, and the greedy capacity-first-fit
+    split of each (round, vehicle) slot is resolved on a window at their head, vectorized over
+    the population and the window: genes larger than the remaining room are dropped in bulk,
+    the fitting prefix of the rest is taken with one cumsum and the gene that overflowed is
+    skipped. The window only widens while some vehicle still has room for more deliveries,
+    so (like the scalar split, which stops at a full vehicle) a slot costs about the size of
+    its route, not of the chromosome.
+    """
+    def __init__(self, instance: ProblemInstance, window: int = 8):
+        self.instance = instance
+        self.demand = np.asarray(instance.demand, dtype=np.int64)
+        self.priority = np.asarray(instance.priority, dtype=np.int64)
+        self.capacity = np.asarray(instance.capacity, dtype=np.int64)
+        self.max_range = np.asarray(instance.max_range, dtype=np.float64)
+        self.cost = np.asarray(instance.cost, dtype=np.float64)
+        self.min_demand = instance.min_demand
+        self.distances = instance.distance_matrix.matrix
+        self.window = window
+
+    def first_fit(self, candidates: np.ndarray, window_demand: np.ndarray, capacity: int) -> tuple[np.ndarray, np.ndarray]:
+        """Genes taken by one vehicle (first fit over `candidates`, in order) and its room left."""
+        taken = np.zeros_like(candidates)
+        room = np.full(len(candidates), capacity, dtype=np.int64)
+        candidates = candidates.copy()
+
+        while True:
+            # A gene that does not fit now never will (the load only grows)
+            candidates &= window_demand <= room[:, None]
+            if not candidates.any():
+                return taken, room
+
+            load = np.cumsum(np.where(candidates, window_demand, 0), axis=1)
+            prefix = candidates & (load <= room[:, None])
+            taken |= prefix
+            room -= np.where(prefix, window_demand, 0).sum(axis=1)
+            candidates &= ~prefix
+
+            # The first remaining candidate is the one that overflowed the prefix: skip it
+            rows = np.flatnonzero(candidates.any(axis=1))
+            candidates[rows, np.argmax(candidates[rows], axis=1)] = False
+
+    def evaluate(self, population: np.ndarray) -> np.ndarray:
+        population = np.asarray(population, dtype=np.int64)
+        if population.ndim != 2:
+            raise ValueError("Population must be a 2-D array (pop_size x n_deliveries).")
+
+        pop_size, n_genes = population.shape
+        # Unassigned genes of each row are genes[row, head[row]:n_genes], in chromosome order
+        # (padded so that a window never runs past the end of the row)
+        genes = np.concatenate((population, np.zeros_like(population)), axis=1)
+        head = np.zeros(pop_size, dtype=np.int64)
+        n_routes = np.zeros(pop_size, dtype=np.int64)
+        active = np.ones(pop_size, dtype=bool)
+        total_cost = np.zeros(pop_size)
+        penalty = np.zeros(pop_size)
+
+        while active.any():
+            routes_before = n_routes.copy()
+
+            for v in range(len(self.capacity)):
+                width = min(self.window, n_genes)
+                while True:
+                    columns = head[:, None] + np.arange(width)
+                    valid = active[:, None] & (columns < n_genes)
+                    window = np.take_along_axis(genes, columns, axis=1)
+                    window_demand = self.demand[window]
+                    take, room = self.first_fit(valid, window_demand, self.capacity[v])
+                    # Widen while a vehicle with room left has genes beyond the window
+                    if width == n_genes or not np.any((room >= self.min_demand) & (head + width < n_genes) & active):
+                        break
+                    width = min(2 * width, n_genes)
+
+                count = take.sum(axis=1)
+                has_route = count > 0
+                if not has_route.any():
+                    continue
+
+                # Previous stop of every taken gene (depot for the first one)
+                last_taken = np.maximum.accumulate(np.where(take, np.arange(width), -1), axis=1)
+                previous = np.concatenate((np.full((pop_size, 1), -1), last_taken[:, :-1]), axis=1)
+                previous_gene = np.where(previous >= 0, np.take_along_axis(window, np.maximum(previous, 0), axis=1), 0)
+                legs = np.where(take, self.distances[previous_gene, window], 0.0)
+                # Sequential sum (cumsum) keeps the scalar accumulation order
+                dist = np.cumsum(legs, axis=1)[:, -1]
+                end_gene = np.take_along_axis(window, np.maximum(last_taken[:, -1:], 0), axis=1)[:, 0]
+                dist += np.where(has_route, self.distances[end_gene, 0], 0.0)
+                load = self.capacity[v] - room
+
+                # 1. Capacity
+                penalty += np.where(has_route, CAPACITY_PENALTY * np.maximum(load - self.capacity[v], 0), 0.0)
+
+                # 3. Autonomy
+                penalty += np.where(has_route, AUTONOMY_PENALTY * np.maximum(dist - self.max_range[v], 0.0), 0.0)
+
+                # 4. Travel cost
+                travel_cost = dist * self.cost[v]
+                total_cost += np.where(has_route, travel_cost, 0.0)
+
+                # 5. Cost efficiency
+                cost_per_delivery = travel_cost / np.maximum(count, 1)
+                inefficiency = np.maximum(cost_per_delivery - COST_EFFICIENCY_THRESHOLD, 0.0)
+                penalty += np.where(has_route, inefficiency * COST_EFFICIENCY_WEIGHT, 0.0)
+
+                # 6. Critical / high priority penalties (route index and position)
+                route_index = n_routes.astype(np.float64)[:, None]
+                position = np.cumsum(take, axis=1) - 1
+                window_priority = self.priority[window]
+                priority_penalty = np.where(
+                    window_priority == 3,
+                    route_index * CRITICAL_WEIGHT + position * CRITICAL_POS_WEIGHT + (route_index ** 2) * 2.0,
+                    np.where(window_priority == 2, route_index * HIGH_PRIORITY_WEIGHT + position * HIGH_PRIORITY_POS_WEIGHT, 0.0)
+                )
+                penalty += np.where(take, priority_penalty, 0.0).sum(axis=1)
+
+                # Drop the taken genes: the window's skipped genes move to its end (order kept)
+                # and the head advances past the taken ones
+                order = np.argsort(~take, axis=1, kind="stable")
+                np.put_along_axis(genes, columns, np.take_along_axis(window, order, axis=1), axis=1)
+                head += count
+                n_routes += has_route
+
+            # Stop individuals that are fully assigned or made no progress in this round
+            active &= (n_routes > routes_before) & (head < n_genes)
+
+        return total_cost + penalty
+
+def evaluate_population(population: np.ndarray, instance: ProblemInstance | str) -> np.ndarray:
+    if isinstance(instance, str):
+        instance = load_problem_instance(instance)
+    return BatchFitnessEvaluator(instance).evaluate(population)
+
+if __name__ == "__main__":
+    import random
+    from _encode_decode import decode_chromosome
+    from c_fitness import calculate_fitness
+    from delivery_setup.problem_instance import synthetic_problem_instance
+
+    # Parity with decode_chromosome + calculate_fitness (the reference this evaluator must match)
+    for instance in (load_problem_instance("SP"), synthetic_problem_instance(500, 20, seed=1)):
+        population = np.array([random.sample(instance.delivery_ids, instance.n_deliveries) for _ in range(300)])
+        batch = evaluate_population(population, instance)
+        scalar = np.array([calculate_fitness(decode_chromosome(c.tolist(), instance), instance) for c in population])
+        print(f"{instance.n_deliveries} deliveries: max relative difference (batch vs scalar) {np.max(np.abs(batch - scalar) / np.abs(scalar)):.3e}")
+        assert np.allclose(batch, scalar, rtol=1e-9, atol=0.0), f"Batch fitness diverged from calculate_fitness ({instance.n_deliveries} deliveries)"
@@ -0,0 +1,147 @@
+from _encode_decode import decode_chromosome, split_routes
+from c_fitness import route_fitness
+from e_mutation import apply_move
+from delivery_setup.problem_instance import ProblemInstance
+
+class FitnessBreakdown:
+    """
+    Per-route cache of an evaluated chromosome: each route's decoder slot, vehicle and
+    deliveries, and its (load, distance, travel cost, penalty) components.
+    """
+    def __init__(self, chromosome: list[int], routes: list[tuple[int, str, tuple[int]]], components: list[tuple[int, float, float, float]]):
+        self.chromosome = chromosome
+        self.slotted_routes = routes
+        self.components = components
+
+        # Route index of every chromosome position (-1 when left unassigned by the decoder)
+        position = {gene: pos for pos, gene in enumerate(chromosome)}
+        self.route_of_position = [-1] * len(chromosome)
+        self.route_positions = []
+        for route_index, (_, _, route) in enumerate(routes):
+            positions = [position[gene] for gene in route]
+            for pos in positions:
+                self.route_of_position[pos] = route_index
+            self.route_positions.append(positions)
+
+    @property
+    def routes(self) -> list[tuple[str, tuple[int]]]:
+        return [(v, route) for _, v, route in self.slotted_routes]
+
+    @property
+    def fitness(self) -> float:
+        return sum(travel_cost + penalty for _, _, travel_cost, penalty in self.components)
+
+def fitness_breakdown(chromosome: list[int], instance: ProblemInstance) -> FitnessBreakdown:
+    routes = split_routes(list(chromosome), instance)
+    components = [route_fitness(i, v, route, instance) for i, (_, v, route) in enumerate(routes)]
+    return FitnessBreakdown(list(chromosome), routes, components)
+
+def affected_routes(breakdown: FitnessBreakdown, move: tuple[str, int, int], instance: ProblemInstance) -> set[int] | None:
+    """
+    Routes touched by a swap/relocate move when decode_chromosome keeps the same split,
+    or None when the split may change.
+
+    The split is preserved when every position spanned by the move belongs to one route
+    (earlier vehicles rejected all of those genes at the same load, the owning vehicle
+    accepted all of them), or when a swap exchanges two genes of equal demand (every
+    vehicle sees the same demand at every position).
+    """
+    kind, i, j = move
+    route_of = breakdown.route_of_position
+    lo, hi = min(i, j), max(i, j)
+
+    route = route_of[lo]
+    if all(route_of[pos] == route for pos in range(lo + 1, hi + 1)):
+        return {route} if route >= 0 else set()
+
+    if kind == "swap":
+        chromosome = breakdown.chromosome
+        if instance.demand[chromosome[i]] == instance.demand[chromosome[j]] and route_of[i] >= 0 and route_of[j] >= 0:
+            return {route_of[i], route_of[j]}
+
+    return None
+
+def delta_fitness(breakdown: FitnessBreakdown, move: tuple[str, int, int], instance: ProblemInstance) -> tuple[float, FitnessBreakdown]:
+    """
+    Fitness of the chromosome obtained by applying `move` to the one cached in `breakdown`.
+
+    Standalone API for local search over an evaluated chromosome; the GA does not call it
+    (its mutation acts on crossover children, which have no breakdown yet). Most random
+    moves change the split, so the gain over a full evaluation is modest (~1.4x on 500
+    deliveries x 20 vehicles, see __main__).
+
+    When the split is preserved only the affected routes are rescored. Otherwise the split
+    is redone from the first route owning a position inside the move span (earlier vehicle
+    passes accept nothing in the span, so they are unchanged), and any re-decoded route
+    identical to the parent's reuses its cached components. Returns the new fitness and
+    the child's breakdown.
+    """
+    mutant = apply_move(breakdown.chromosome, move)
+
+    affected = affected_routes(breakdown, move, instance)
+    if affected is not None:
+        routes = list(breakdown.slotted_routes)
+        components = list(breakdown.components)
+        for route_index in affected:
+            slot, vehicle_id, _ = routes[route_index]
+            route = tuple(mutant[pos] for pos in breakdown.route_positions[route_index])
+            routes[route_index] = (slot, vehicle_id, route)
+            components[route_index] = route_fitness(route_index, vehicle_id, route, instance)
+
+        child = FitnessBreakdown(mutant, routes, components)
+        return child.fitness, child
+
+    # Resume the split at the first route that may change
+    _, i, j = move
+    route_of = breakdown.route_of_position
+    span_routes = [route_of[pos] for pos in range(min(i, j), max(i, j) + 1) if route_of[pos] >= 0]
+    first = min(span_routes)
+
+    n_vehicles = len(instance.vehicle_ids)
+    parent_routes = breakdown.slotted_routes
+    start_slot = parent_routes[first][0]
+    routes_created = first > 0 and parent_routes[first - 1][0] // n_vehicles == start_slot // n_vehicles
+    remaining = [gene for pos, gene in enumerate(mutant) if not 0 <= route_of[pos] < first]
+
+    routes = parent_routes[:first] + split_routes(remaining, instance, start_slot, routes_created)
+    components = breakdown.components[:first]
+    for route_index in range(first, len(routes)):
+        if route_index < len(parent_routes) and routes[route_index] == parent_routes[route_index]:
+            components.append(breakdown.components[route_index])
+        else:
+            _, vehicle_id, route = routes[route_index]
+            components.append(route_fitness(route_index, vehicle_id, route, instance))
+
+    child = FitnessBreakdown(mutant, routes, components)
+    return child.fitness, child
+
+if __name__ == "__main__":
+    import random
+    import time
+    from c_fitness import calculate_fitness
+    from e_mutation import light_mutation_move
+    from delivery_setup.problem_instance import synthetic_problem_instance
+
+    instance = synthetic_problem_instance(500, 20, seed=1)
+    breakdown = fitness_breakdown(random.sample(instance.delivery_ids, instance.n_deliveries), instance)
+
+    delta_time = full_time = 0
+    fallbacks = moves = 0
+    for _ in range(300):
+        _, move = light_mutation_move(breakdown.chromosome, prob=1.0)
+        moves += 1
+        fallbacks += affected_routes(breakdown, move, instance) is None
+
+        start = time.perf_counter()
+        fitness, child = delta_fitness(breakdown, move, instance)
+        delta_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        expected = calculate_fitness(decode_chromosome(child.chromosome, instance), instance)
+        full_time += time.perf_counter() - start
+
+        assert abs(fitness - expected) <= 1e-9 * max(1.0, abs(expected))
+        breakdown = child
+
+    print(f"Moves: {moves} | Split changed (partial re-decode): {fallbacks}")
+    print(f"Delta: {delta_time * 1e3:.1f} ms | Full: {full_time * 1e3:.1f} ms")
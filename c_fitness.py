@@ -1,8 +1,6 @@
-from address_routes.distribute_center import get_center_coordinates
+import _kernels
 from a_generate_population import generate_population_coordinates
-from b_manhattan_distance import route_distance
-from delivery_setup.deliveries import load_deliveries_info as ldi
-from delivery_setup.vehicles import load_vehicles_info as lvi
+from delivery_setup.problem_instance import ProblemInstance, load_problem_instance
 
 # Weight factors for balanced optimization
 CAPACITY_PENALTY = 100      # Reduced from 200 (soft constraint)
@@ -14,60 +12,73 @@ HIGH_PRIORITY_POS_WEIGHT = 0.6  # Increased from 0.3 (position penalty)
 COST_EFFICIENCY_THRESHOLD = 5.0  # Cost per delivery threshold (recalibrated)
 COST_EFFICIENCY_WEIGHT = 5  # Penalty weight for inefficient routes (balanced)
 
-def calculate_fitness(solution: dict[str, list[str]], city: str) -> float:
-    deliveries = ldi(city)  # Cities info
-    vehicles = lvi(city)    # Vehicles info
-    total_cost = 0
+def route_fitness(route_index: int, vehicle_id: str, route: tuple[int], instance: ProblemInstance) -> tuple[int, float, float, float]:
+    """Return (load, distance, travel cost, penalty) of a single route at position `route_index`."""
+    v_idx = instance.vehicle_index[vehicle_id]
+    capacity = instance.capacity[v_idx]
+    max_range = instance.max_range[v_idx]
+    priorities = instance.priority
     penalty = 0
 
-    for route_index, (vehicle_id, route) in enumerate(solution):
-        vehicle = vehicles[vehicle_id]
+    # 1. Capacity (softer constraint - allows slight overload)
+    demands = instance.demand
+    load = sum(demands[d] for d in route)
+    if load > capacity:
+        penalty += CAPACITY_PENALTY * (load - capacity)
 
-        # 1. Capacity (softer constraint - allows slight overload)
-        load = sum(deliveries[d]["demand"] for d in route)
-        if load > vehicle["capacity"]:
-            penalty += CAPACITY_PENALTY * (load - vehicle["capacity"])
+    # 2. Manhattan distance of the route (matrix lookup)
+    dist_M = instance.distance_matrix.route_distance(route)
 
-        # 2. Manhattan distance of the route
-        list_coords = []
-        for dlv_id in route:
-            list_coords.append((deliveries[dlv_id]['lat'], deliveries[dlv_id]['lon']))
+    # 3. Autonomy (hard constraint - cannot exceed)
+    if dist_M > max_range:
+        penalty += AUTONOMY_PENALTY * (dist_M - max_range)
 
-        dist_M = route_distance(list_coords, center_coords=get_center_coordinates(city))
+    # 4. Travel cost (higher weight in total fitness)
+    travel_cost = dist_M * instance.cost[v_idx]
 
-        # 3. Autonomy (hard constraint - cannot exceed)
-        if dist_M > vehicle["max_range_M"]:
-            penalty += AUTONOMY_PENALTY * (dist_M - vehicle["max_range_M"])
+    # 5. Cost efficiency penalty (penalizes inefficient routes)
+    num_deliveries = len(route)
+    if num_deliveries > 0:
+        cost_per_delivery = travel_cost / num_deliveries
+        if cost_per_delivery > COST_EFFICIENCY_THRESHOLD:
+            inefficiency = cost_per_delivery - COST_EFFICIENCY_THRESHOLD
+            penalty += inefficiency * COST_EFFICIENCY_WEIGHT
 
-        # 4. Travel cost (higher weight in total fitness)
-        travel_cost = dist_M * vehicle["cost_M"]
+    # 6. Critical delivery penalties (hybrid: linear + quadratic)
+    if _kernels.accel is not None:
+        penalty = _kernels.accel.priority_penalty(instance.priority_array, route, route_index, penalty,
+            CRITICAL_WEIGHT, CRITICAL_POS_WEIGHT, HIGH_PRIORITY_WEIGHT, HIGH_PRIORITY_POS_WEIGHT)
+        return load, dist_M, travel_cost, penalty
 
-        # 5. Cost efficiency penalty (penalizes inefficient routes)
-        num_deliveries = len(route)
-        if num_deliveries > 0:
-            cost_per_delivery = travel_cost / num_deliveries
-            if cost_per_delivery > COST_EFFICIENCY_THRESHOLD:
-                inefficiency = cost_per_delivery - COST_EFFICIENCY_THRESHOLD
-                penalty += inefficiency * COST_EFFICIENCY_WEIGHT
+    for pos, d_id in enumerate(route):
+        priority = priorities[d_id]
+        if priority == 3:
+            # Critical: linear penalty + quadratic penalty for late routes
+            linear_penalty = route_index * CRITICAL_WEIGHT + pos * CRITICAL_POS_WEIGHT
+            quadratic_penalty = (route_index ** 2) * 2.0  # Balanced exponential growth
+            penalty += linear_penalty + quadratic_penalty
+        elif priority == 2:
+            # High priority: moderate linear penalty
+            penalty += route_index * HIGH_PRIORITY_WEIGHT + pos * HIGH_PRIORITY_POS_WEIGHT
 
-        # 6. Critical delivery penalties (hybrid: linear + quadratic)
-        for pos, d_id in enumerate(route):
-            priority = deliveries[d_id]["priority"]
-            if priority == 3:
-                # Critical: linear penalty + quadratic penalty for late routes
-                linear_penalty = route_index * CRITICAL_WEIGHT + pos * CRITICAL_POS_WEIGHT
-                quadratic_penalty = (route_index ** 2) * 2.0  # Balanced exponential growth
-                penalty += linear_penalty + quadratic_penalty
-            elif priority == 2:
-                # High priority: moderate linear penalty
-                penalty += route_index * HIGH_PRIORITY_WEIGHT + pos * HIGH_PRIORITY_POS_WEIGHT
+    return load, dist_M, travel_cost, penalty
 
+def calculate_fitness(solution: dict[str, list[str]], instance: ProblemInstance | str) -> float:
+    if isinstance(instance, str):
+        instance = load_problem_instance(instance)  # City code (cached instance)
+
+    total_cost = 0
+    penalty = 0
+
+    for route_index, (vehicle_id, route) in enumerate(solution):
+        _, _, travel_cost, route_penalty = route_fitness(route_index, vehicle_id, route, instance)
         total_cost += travel_cost
+        penalty += route_penalty
 
     return total_cost + penalty
 
 if __name__ == "__main__":
     candidates_individuals = generate_population_coordinates("SP", 10)
     print(candidates_individuals[0])
-    fit_value = calculate_fitness(candidates_individuals[0], "SP")
+    fit_value = calculate_fitness(candidates_individuals[0], load_problem_instance("SP"))
     print(f"Fitness Value: {fit_value}")
@@ -0,0 +1,60 @@
+from array import array
+from collections import OrderedDict
+import numpy as np
+
+def chromosome_key(chromosome: list[int] | np.ndarray) -> bytes:
+    """
+    Compact hashable key of a chromosome: the raw buffer of an array row, or one byte per
+    gene for lists while IDs fit in a byte. Keys are only comparable within one representation.
+    """
+    if isinstance(chromosome, np.ndarray):
+        return chromosome.tobytes()
+    try:
+        return bytes(chromosome)
+    except ValueError:
+        return array('i', chromosome).tobytes()
+
+class FitnessCache:
+    """
+    Bounded LRU cache of fitness values keyed by chromosome.
+
+    Hit, miss and eviction counters accumulate until `generation_stats()` is called,
+    which returns them and starts a new count for the next generation.
+    """
+    def __init__(self, max_size: int = 50_000):
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1.")
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: bytes) -> float | None:
+        fitness = self.entries.get(key)
+        if fitness is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return fitness
+
+    def put(self, key: bytes, fitness: float):
+        self.entries[key] = fitness
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def generation_stats(self) -> dict[str, int]:
+        stats = {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self.entries)
+        }
+        self.hits = self.misses = self.evictions = 0
+        return stats
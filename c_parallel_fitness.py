@@ -0,0 +1,74 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from _encode_decode import decode_chromosome
+from c_fitness import calculate_fitness
+from delivery_setup.problem_instance import ProblemInstance, load_problem_instance
+
+# Per-worker state, set once by the pool initializer
+_worker_instance = None
+
+def _init_worker(instance: ProblemInstance | str):
+    global _worker_instance
+    _worker_instance = load_problem_instance(instance) if isinstance(instance, str) else instance
+
+def _evaluate_chunk(chunk: np.ndarray) -> np.ndarray:
+    fitness = np.empty(len(chunk), dtype=np.float64)
+    for i, chromosome in enumerate(chunk.tolist()):
+        routes = decode_chromosome(chromosome, _worker_instance)
+        fitness[i] = calculate_fitness(routes, _worker_instance)
+    return fitness
+
+class ParallelFitnessEvaluator:
+    """
+    Fans population chunks out to a process pool whose workers build the problem instance once.
+
+    Chromosomes travel as compact integer arrays and fitness values come back as float64
+    arrays, reassembled in submission order, so results do not depend on the worker count.
+    """
+    def __init__(self, instance: ProblemInstance | str, workers: int, chunks_per_worker: int = 2):
+        if workers < 1:
+            raise ValueError("workers must be >= 1.")
+        self.workers = workers
+        self.chunks_per_worker = chunks_per_worker
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(instance,)
+        )
+
+    def evaluate(self, population: list[list[int]] | np.ndarray) -> np.ndarray:
+        chromosomes = np.asarray(population)
+        dtype = np.int16 if chromosomes.max() < np.iinfo(np.int16).max else np.int32
+        chromosomes = chromosomes.astype(dtype, copy=False)
+
+        n_chunks = min(len(chromosomes), self.workers * self.chunks_per_worker)
+        chunks = np.array_split(chromosomes, n_chunks)
+        return np.concatenate(list(self.executor.map(_evaluate_chunk, chunks)))
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    instance = load_problem_instance("SP")
+    population = [random.sample(instance.delivery_ids, instance.n_deliveries) for _ in range(3000)]
+
+    start = time.perf_counter()
+    serial = [calculate_fitness(decode_chromosome(c, instance), instance) for c in population]
+    print(f"Serial: {time.perf_counter() - start:.3f}s")
+
+    with ParallelFitnessEvaluator("SP", workers=4) as evaluator:
+        evaluator.evaluate(population[:8])  # Warm-up (pool start)
+        start = time.perf_counter()
+        parallel = evaluator.evaluate(population)
+        print(f"Parallel (4 workers): {time.perf_counter() - start:.3f}s")
+
+    print(f"Identical results: {np.array_equal(np.array(serial), parallel)}")
@@ -1,52 +1,91 @@
-from b_manhattan_distance import cartesian_to_manhattan as manhattan
 from _encode_decode import decode_chromosome
+from b_distance_matrix import DistanceMatrix
+from delivery_setup.problem_instance import ProblemInstance
 import random
+import _kernels
 
-def RBX(parent1, parent2, deliveries, vehicles, center):
-    routes_p1 = dict(decode_chromosome(parent1, deliveries, vehicles))
+def resolve_routes(parent, instance: ProblemInstance, routes=None) -> list[tuple[str, tuple[int]]]:
+    # Precomputed route split, a zero-argument callable producing it lazily, or None (decode now)
+    if routes is None:
+        return decode_chromosome(parent, instance)
+    return routes() if callable(routes) else routes
 
-    selected_vehicle = random.choice(list(routes_p1.keys()))
+def RBX(parent1, parent2, instance: ProblemInstance, routes_p1=None, rng: random.Random = None):
+    rng = rng if rng is not None else random  # Module functions: global generator
+    routes_p1 = dict(resolve_routes(parent1, instance, routes_p1))
+
+    selected_vehicle = rng.choice(list(routes_p1.keys()))
     inherited_route = list(routes_p1[selected_vehicle])
 
     child = inherited_route.copy()
 
+    # Membership array indexed by delivery ID (O(1) "gene in child")
+    in_child = bytearray(len(instance.demand))
+    for gene in inherited_route:
+        in_child[gene] = 1
+
     for gene in parent2:
-        if gene not in child:
+        if not in_child[gene]:
             child.append(gene)
 
     return child
 
-def BCRC(parent1, parent2, deliveries):
-    i, j = sorted(random.sample(range(len(parent1)), 2))
-    subroute = parent1[i:j]
+def insertion_ties(distance_matrix: DistanceMatrix, base: list[int], subroute: list[int]) -> list[int]:
+    """Insertion positions of `subroute` in `base` tied (within tolerance) for the lowest path cost."""
+    if _kernels.accel is not None:
+        return _kernels.accel.insertion_ties(distance_matrix.matrix, base, subroute)
+
+    # Inserting the subroute at `pos` replaces the base leg (pos-1 -> pos) by the two boundary
+    # legs, so cost(pos) = base legs + subroute legs + delta(pos): O(1) per position.
+    rows = distance_matrix.rows
+    first, last = subroute[0], subroute[-1]
+    base_cost = distance_matrix.path_cost(base)
+    sub_cost = distance_matrix.path_cost(subroute)
 
-    base = [g for g in parent2 if g not in subroute]
+    deltas = [rows[last][base[0]]]
+    for pos in range(1, len(base)):
+        a, b = base[pos - 1], base[pos]
+        deltas.append(rows[a][first] + rows[last][b] - rows[a][b])
+    deltas.append(rows[base[-1]][first])
+
+    # Near-ties are resolved with the full leg-by-leg sum, so the chosen position is the
+    # same as scoring every candidate sequentially (first position with the lowest cost)
+    best_delta = min(deltas)
+    tolerance = 1e-9 * (1.0 + base_cost + sub_cost)
+    return [pos for pos, delta in enumerate(deltas) if delta - best_delta <= tolerance]
+
+def BCRC(parent1, parent2, instance: ProblemInstance, rng: random.Random = None):
+    rng = rng if rng is not None else random
+    path_cost = instance.distance_matrix.path_cost
+    i, j = sorted(rng.sample(range(len(parent1)), 2))
+    subroute = parent1[i:j]
 
-    best_pos = 0
-    best_cost = float("inf")
+    in_subroute = bytearray(len(instance.demand))
+    for g in subroute:
+        in_subroute[g] = 1
 
-    for pos in range(len(base) + 1):
-        candidate = base[:pos] + subroute + base[pos:]
-        cost = 0
+    base = [g for g in parent2 if not in_subroute[g]]
+    if not base:
+        return subroute
 
-        for k in range(len(candidate) - 1):
-            a = candidate[k]
-            b = candidate[k + 1]
-            cost += manhattan(
-                (deliveries[a]["lat"], deliveries[a]["lon"]),
-                (deliveries[b]["lat"], deliveries[b]["lon"])
-            )
+    tied = insertion_ties(instance.distance_matrix, base, subroute)
 
-        if cost < best_cost:
-            best_cost = cost
-            best_pos = pos
+    best_pos = tied[0]
+    if len(tied) > 1:
+        best_cost = float("inf")
+        for pos in tied:
+            cost = path_cost(base[:pos] + subroute + base[pos:])
+            if cost < best_cost:
+                best_cost = cost
+                best_pos = pos
 
     return base[:best_pos] + subroute + base[best_pos:]
 
-def crossover(parent1, parent2, deliveries, vehicles, center,
-    p_rbx=0.5):
+def crossover(parent1, parent2, instance: ProblemInstance,
+    p_rbx=0.5, routes_p1=None, rng: random.Random = None):
+    rng = rng if rng is not None else random
 
-    if random.random() < p_rbx:
-        return RBX(parent1, parent2, deliveries, vehicles, center)
+    if rng.random() < p_rbx:
+        return RBX(parent1, parent2, instance, routes_p1, rng)
     else:
-        return BCRC(parent1, parent2, deliveries)
+        return BCRC(parent1, parent2, instance, rng)
@@ -0,0 +1,116 @@
+import random
+import numpy as np
+from functools import lru_cache
+from address_routes.distribute_center import get_center_coordinates
+from b_distance_matrix import DistanceMatrix, manhattan_matrix, load_distance_matrix
+from delivery_setup.deliveries import load_deliveries_info as ldi
+from delivery_setup.vehicles import load_vehicles_info as lvi
+
+class ProblemInstance:
+    """
+    Compiled view of a city's routing problem, built once and shared by the GA operators.
+
+    Delivery attributes are stored as flat tuples indexed by delivery ID, with index 0
+    reserved for the depot (distribution center). Vehicle attributes are flat tuples
+    indexed by the vehicle position in `vehicle_ids`. `distance_matrix` shares the same
+    delivery ID indexing: the Manhattan matrix of the coordinates, unless a precomputed
+    (e.g. road network) matrix is given.
+    """
+    def __init__(self, city: str, deliveries: dict[int, dict], vehicles: dict[str, dict], depot: tuple[float, float], distance_matrix: DistanceMatrix = None):
+        self.city = city
+        self.deliveries = deliveries
+        self.vehicles = vehicles
+        self.depot = (float(depot[0]), float(depot[1]))
+
+        # Deliveries (index 0 = depot)
+        self.delivery_ids = tuple(sorted(deliveries.keys()))
+        size = max(self.delivery_ids) + 1
+        lat = [self.depot[0]] + [0.0] * (size - 1)
+        lon = [self.depot[1]] + [0.0] * (size - 1)
+        demand = [0] * size
+        priority = [0] * size
+        for d_id in self.delivery_ids:
+            lat[d_id] = deliveries[d_id]["lat"]
+            lon[d_id] = deliveries[d_id]["lon"]
+            demand[d_id] = deliveries[d_id]["demand"]
+            priority[d_id] = deliveries[d_id]["priority"]
+
+        self.lat = tuple(lat)
+        self.lon = tuple(lon)
+        self.demand = tuple(demand)
+        self.priority = tuple(priority)
+        self.min_demand = min(demand[d_id] for d_id in self.delivery_ids)
+        if distance_matrix is not None and len(distance_matrix) != size:
+            raise ValueError(f"Distance matrix has {len(distance_matrix)} points, the instance needs {size}.")
+        self.distance_matrix: DistanceMatrix = distance_matrix if distance_matrix is not None else manhattan_matrix(self.lat, self.lon)
+
+        # Vehicles (in the same order used by decode_chromosome)
+        self.vehicle_ids = tuple(vehicles.keys())
+        self.vehicle_index = {v: i for i, v in enumerate(self.vehicle_ids)}
+        self.capacity = tuple(vehicles[v]["capacity"] for v in self.vehicle_ids)
+        self.max_range = tuple(vehicles[v]["max_range_M"] for v in self.vehicle_ids)
+        self.cost = tuple(vehicles[v]["cost_M"] for v in self.vehicle_ids)
+
+        # Typed int64 copies read by the compiled kernels (_kernels.accel)
+        self.demand_array = np.asarray(self.demand, dtype=np.int64)
+        self.priority_array = np.asarray(self.priority, dtype=np.int64)
+        self.capacity_array = np.asarray(self.capacity, dtype=np.int64)
+
+    @property
+    def n_deliveries(self) -> int:
+        return len(self.delivery_ids)
+
+    @classmethod
+    def from_city(cls, city: str, distance_matrix_path: str = None) -> "ProblemInstance":
+        if distance_matrix_path is None:
+            return cls(city, ldi(city), lvi(city), get_center_coordinates(city))
+
+        distance_matrix, metadata = load_distance_matrix(distance_matrix_path)
+        instance = cls(city, ldi(city), lvi(city), get_center_coordinates(city), distance_matrix)
+        # The matrix rows must refer to this city's points, in delivery ID order
+        points = np.asarray(metadata['points'], dtype=np.float64)
+        expected = np.column_stack([instance.lat, instance.lon])
+        if metadata.get('city') != city or points.shape != expected.shape or not np.allclose(points, expected, rtol=0, atol=1e-6):
+            raise ValueError(f"{distance_matrix_path} was built for other points than the {city} deliveries.")
+        return instance
+
+@lru_cache(maxsize=None)
+def load_problem_instance(city: str, distance_matrix_path: str = None) -> ProblemInstance:
+    """
+    Return the cached ProblemInstance of a city, building it on first use. With
+    `distance_matrix_path`, distances come from that precomputed matrix (see
+    delivery_setup/road_matrix.py) instead of the Manhattan metric.
+    """
+    return ProblemInstance.from_city(city, distance_matrix_path)
+
+def synthetic_problem_instance(n_deliveries: int, n_vehicles: int = 5, seed: int = 0, city: str = "SP") -> ProblemInstance:
+    """
+    Scalable random instance for benchmarks: deliveries spread over the bounding box of the
+    city's units (demand/priority drawn from the real mix) and a fleet cycling the city's vehicles.
+    """
+    rng = random.Random(seed)
+    base = load_problem_instance(city)
+    min_lat, max_lat = min(base.lat[1:]), max(base.lat[1:])
+    min_lon, max_lon = min(base.lon[1:]), max(base.lon[1:])
+    base_deliveries = list(base.deliveries.values())
+
+    deliveries = {}
+    for d_id in range(1, n_deliveries + 1):
+        template = rng.choice(base_deliveries)
+        deliveries[d_id] = {
+            "lat": rng.uniform(min_lat, max_lat),
+            "lon": rng.uniform(min_lon, max_lon),
+            "demand": template["demand"],
+            "priority": template["priority"]
+        }
+
+    base_vehicles = list(base.vehicles.values())
+    vehicles = {f"V{i + 1}": dict(base_vehicles[i % len(base_vehicles)]) for i in range(n_vehicles)}
+
+    return ProblemInstance(f"{city}-synthetic-{n_deliveries}x{n_vehicles}", deliveries, vehicles, base.depot)
+
+if __name__ == "__main__":
+    instance = load_problem_instance("SP")
+    print(f"Depot: {instance.depot}")
+    print(f"Deliveries: {instance.n_deliveries} | Vehicles: {instance.vehicle_ids}")
+    print(f"Demands: {instance.demand}")
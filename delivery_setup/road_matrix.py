@@ -0,0 +1,85 @@
+"""
+Offline builder of road-network distance matrices for ProblemInstance.
+
+    python -m delivery_setup.road_matrix SP delivery_setup/matrices/SP_duration.npy --metric duration
+
+Queries the Distance Matrix API once for the city's distinct points (deliveries at the same
+hospital share a row), then writes the (N+1)x(N+1) matrix in delivery ID order with
+save_distance_matrix. Any other source (e.g. an OSM extract routed offline) can produce the
+same .npy + .json pair.
+"""
+import argparse
+from datetime import datetime, timezone
+import numpy as np
+from b_distance_matrix import save_distance_matrix
+from delivery_setup.problem_instance import load_problem_instance
+
+# Distance Matrix API limit: 100 elements per request
+BLOCK = 10
+UNITS = {"distance": "m", "duration": "s"}
+
+def query_road_matrix(api, points: list[tuple[float, float]], metric: str = "duration", mode: str = "driving") -> np.ndarray:
+    """Raw road matrix (meters or seconds) between `points`; unreachable pairs are inf."""
+    n = len(points)
+    matrix = np.zeros((n, n), dtype=np.float64)
+    for i in range(0, n, BLOCK):
+        for j in range(0, n, BLOCK):
+            response = api.get_distance_matrix(points[i:i + BLOCK], points[j:j + BLOCK], mode)
+            for di, row in enumerate(response['rows']):
+                for dj, element in enumerate(row['elements']):
+                    matrix[i + di, j + dj] = element[metric]['value'] if element['status'] == "OK" else np.inf
+    np.fill_diagonal(matrix, 0.0)
+    return matrix
+
+def manhattan_scale(road: np.ndarray, manhattan: np.ndarray) -> float:
+    """Least-squares factor k minimizing |k * road - manhattan| over the reachable pairs."""
+    mask = np.isfinite(road) & (road > 0)
+    return float(np.sum(road[mask] * manhattan[mask]) / np.sum(road[mask] ** 2))
+
+def build_road_matrix(city: str, path: str, api=None, metric: str = "duration", mode: str = "driving", calibrate: bool = True) -> dict[str, any]:
+    """
+    Build and save the road matrix of a city's instance; returns its metadata.
+
+    With `calibrate`, values are stored in Manhattan-equivalent units (road value times the
+    least-squares `scale` against the Manhattan matrix), so the vehicles' max_range_M and
+    cost_M keep their meaning while the relative distances follow the road network; the
+    real value of an entry is entry / scale (in `unit`).
+    """
+    if metric not in UNITS:
+        raise ValueError(f"Unknown metric '{metric}', choose 'distance' or 'duration'.")
+    if api is None:
+        from itinerary_routes.a_google_maps import GoogleMapsAPI
+        api = GoogleMapsAPI(cache_path=None)
+
+    instance = load_problem_instance(city)
+    points = list(zip(instance.lat, instance.lon))
+    unique_points = sorted(set(points), key=points.index)
+    position = [unique_points.index(point) for point in points]
+
+    road = query_road_matrix(api, unique_points, metric, mode)[np.ix_(position, position)]
+    scale = manhattan_scale(road, instance.distance_matrix.matrix) if calibrate else 1.0
+
+    metadata = {
+        'city': city,
+        'metric': metric,
+        'unit': UNITS[metric],
+        'mode': mode,
+        'scale': scale,
+        'source': "Google Distance Matrix API",
+        'created': datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        'points': [list(point) for point in points]
+    }
+    save_distance_matrix(path, road * scale, metadata)
+    return metadata
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a road-network distance matrix for a city's ProblemInstance.")
+    parser.add_argument("city")
+    parser.add_argument("path", help="output .npy file (metadata goes to the .json next to it)")
+    parser.add_argument("--metric", choices=list(UNITS), default="duration")
+    parser.add_argument("--mode", default="driving")
+    parser.add_argument("--raw", action="store_true", help="store raw meters/seconds instead of Manhattan-equivalent units")
+    args = parser.parse_args()
+
+    metadata = build_road_matrix(args.city, args.path, metric=args.metric, mode=args.mode, calibrate=not args.raw)
+    print(f"Matriz {args.metric} de {args.city} salva em {args.path} (escala {metadata['scale']:.3e} por {metadata['unit']})")
@@ -1,34 +1,75 @@
 import random
 
-def swap_mutation(chromosome: list[int], prob: float = 0.1) -> list[int]:
-    if random.random() > prob:
-        return chromosome[:]  # sem mutação
+def swap_move(size: int, rng: random.Random = None) -> tuple[str, int, int]:
+    i, j = (rng if rng is not None else random).sample(range(size), 2)
+    return ("swap", i, j)
 
-    i, j = random.sample(range(len(chromosome)), 2)
+def relocate_move(size: int, rng: random.Random = None) -> tuple[str, int, int]:
+    i, j = (rng if rng is not None else random).sample(range(size), 2)
+    return ("relocate", i, j)
 
+def apply_move(chromosome: list[int], move: tuple[str, int, int]) -> list[int]:
+    kind, i, j = move
     mutant = chromosome[:]
-    mutant[i], mutant[j] = mutant[j], mutant[i]
+
+    if kind == "swap":
+        mutant[i], mutant[j] = mutant[j], mutant[i]
+    elif kind == "relocate":
+        gene = mutant.pop(i)
+        mutant.insert(j, gene)
+    else:
+        raise ValueError(f"Unknown mutation move '{kind}'.")
 
     return mutant
 
-def relocate_mutation(chromosome: list[int], prob: float = 0.1) -> list[int]:
-    if random.random() > prob:
-        return chromosome[:]
+def swap_mutation(chromosome: list[int], prob: float = 0.1, rng: random.Random = None) -> list[int]:
+    rng = rng if rng is not None else random  # Module functions: global generator
+    if rng.random() > prob:
+        return chromosome[:]  # sem mutação
 
-    mutant = chromosome[:]
+    return apply_move(chromosome, swap_move(len(chromosome), rng))
+
+def relocate_mutation(chromosome: list[int], prob: float = 0.1, rng: random.Random = None) -> list[int]:
+    rng = rng if rng is not None else random
+    if rng.random() > prob:
+        return chromosome[:]
 
-    i, j = random.sample(range(len(mutant)), 2)
+    return apply_move(chromosome, relocate_move(len(chromosome), rng))
 
-    gene = mutant.pop(i)
-    mutant.insert(j, gene)
+def apply_move_inplace(chromosome, move: tuple[str, int, int]):
+    """Apply a move directly on a mutable sequence (e.g. a NumPy row of a Population)."""
+    kind, i, j = move
 
-    return mutant
+    if kind == "swap":
+        chromosome[i], chromosome[j] = chromosome[j], chromosome[i]
+    elif kind == "relocate":
+        gene = chromosome[i]
+        if i < j:
+            chromosome[i:j] = chromosome[i + 1:j + 1]
+        else:
+            chromosome[j + 1:i + 1] = chromosome[j:i]
+        chromosome[j] = gene
+    else:
+        raise ValueError(f"Unknown mutation move '{kind}'.")
 
-def light_mutation(chromosome: list[int], prob: float = 0.15) -> list[int]:
-    if random.random() > prob:
-        return chromosome[:]
+def light_mutation_draw(size: int, prob: float = 0.15, rng: random.Random = None) -> tuple[str, int, int] | None:
+    """Draw the light_mutation move for a chromosome of `size` genes (None = no mutation)."""
+    rng = rng if rng is not None else random
+    if rng.random() > prob:
+        return None
 
-    if random.random() < 0.5:
-        return swap_mutation(chromosome, prob=1.0)
+    if rng.random() < 0.5:
+        return swap_move(size, rng)
     else:
-        return relocate_mutation(chromosome, prob=1.0)
+        return relocate_move(size, rng)
+
+def light_mutation_move(chromosome: list[int], prob: float = 0.15, rng: random.Random = None) -> tuple[list[int], tuple[str, int, int] | None]:
+    """Same as light_mutation, but also returns the applied move (None if unchanged) for delta evaluation."""
+    move = light_mutation_draw(len(chromosome), prob, rng)
+    if move is None:
+        return chromosome[:], None
+
+    return apply_move(chromosome, move), move
+
+def light_mutation(chromosome: list[int], prob: float = 0.15, rng: random.Random = None) -> list[int]:
+    return light_mutation_move(chromosome, prob, rng)[0]
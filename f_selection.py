@@ -1,7 +1,8 @@
 import random
+import numpy as np
 
-def tournament_selection(population: list[dict], k: int = 2) -> dict:
-    contenders = random.sample(population, k)
+def tournament_selection(population: list[dict], k: int = 2, rng: random.Random = None) -> dict:
+    contenders = (rng if rng is not None else random).sample(population, k)
     return min(contenders, key=lambda ind: ind["fitness"])
 
 def get_elite(population: list[dict], elite_ratio: float = 0.035) -> list[dict]:
@@ -12,7 +13,8 @@ def select_next_generation(
     population: list[dict],
     pop_size: int,
     elite_ratio: float = 0.035,
-    tournament_k: int = 2
+    tournament_k: int = 2,
+    rng: random.Random = None
     ) -> list[dict]:
 
     # 1. Elite selection
@@ -21,7 +23,48 @@ def select_next_generation(
 
     # 2. Fill the rest via tournament
     while len(selected) < pop_size:
-        parent = tournament_selection(population, k=tournament_k)
+        parent = tournament_selection(population, k=tournament_k, rng=rng)
         selected.append(parent)
 
     return selected
+
+def selection_rng(rng: np.random.Generator | None = None) -> np.random.Generator:
+    # Without an explicit generator, derive one from the `random` module state (keeps random.seed reproducibility)
+    return rng if rng is not None else np.random.default_rng(random.getrandbits(64))
+
+def tournament_indices(fitness: np.ndarray, n: int, k: int = 2, rng: np.random.Generator | None = None) -> np.ndarray:
+    """
+    Winners of `n` tournaments of size `k`, drawn in a single call. Contenders are drawn
+    with replacement (unlike random.sample), which is negligible for k << population size.
+    """
+    fitness = np.asarray(fitness)
+    contenders = selection_rng(rng).integers(0, len(fitness), size=(n, k))
+    winners = np.argmin(fitness[contenders], axis=1)
+    return contenders[np.arange(n), winners]
+
+def elite_indices(fitness: np.ndarray, elite_ratio: float = 0.035) -> np.ndarray:
+    """Indices of the best individuals (best first), via argpartition instead of a full sort."""
+    fitness = np.asarray(fitness)
+    elite_size = max(1, int(len(fitness) * elite_ratio))
+    if elite_size < len(fitness):
+        elite = np.argpartition(fitness, elite_size - 1)[:elite_size]
+    else:
+        elite = np.arange(len(fitness))
+    return elite[np.argsort(fitness[elite], kind="stable")]
+
+def select_next_generation_indices(
+    fitness: np.ndarray,
+    pop_size: int,
+    elite_ratio: float = 0.035,
+    tournament_k: int = 2,
+    rng: np.random.Generator | None = None
+    ) -> np.ndarray:
+    """Index-based select_next_generation, for array-backed populations."""
+
+    # 1. Elite selection
+    elite = elite_indices(fitness, elite_ratio)[:pop_size]
+
+    # 2. Fill the rest via tournament (all tournaments drawn at once)
+    tournaments = tournament_indices(fitness, pop_size - len(elite), k=tournament_k, rng=rng)
+
+    return np.concatenate([elite, tournaments])
@@ -0,0 +1,63 @@
+import time
+import numpy as np
+
+# Stop reasons reported in the GA metadata
+MAX_GENERATIONS = "max_generations"
+PATIENCE = "patience"
+FITNESS_GAP = "fitness_gap"
+DIVERSITY = "diversity"
+TIME_BUDGET = "time_budget"
+
+def population_diversity(chromosomes: np.ndarray, best_index: int) -> float:
+    """Mean normalized Hamming distance to the best chromosome (0 = every individual equals the best)."""
+    return float(np.mean(chromosomes != chromosomes[best_index]))
+
+class EarlyStopping:
+    """
+    Convergence criteria checked by GeneticAlgorithm after each generation is evaluated.
+    Each criterion is disabled by its default value.
+
+    Args:
+        patience: Stop after this many generations without improving the best fitness.
+        min_improvement: Relative improvement of the best fitness that resets the patience window.
+        gap_threshold: Stop when (avg - best) / |best| falls below this value.
+        diversity_floor: Stop when population_diversity falls below this value.
+        time_budget: Wall-clock budget of the run, in seconds.
+        min_generations: Warm-up before the gap and diversity criteria apply (the initial
+            population can be nearly uniform, so both are trivially met at generation 0).
+    """
+    def __init__(self, patience: int = 0, min_improvement: float = 0.0, gap_threshold: float = 0.0, diversity_floor: float = 0.0, time_budget: float = None, min_generations: int = 50):
+        self.patience = patience
+        self.min_improvement = min_improvement
+        self.gap_threshold = gap_threshold
+        self.diversity_floor = diversity_floor
+        self.time_budget = time_budget
+        self.min_generations = min_generations
+        self.start()
+
+    def start(self):
+        """Reset the tracking state at the beginning of a run."""
+        self.start_time = time.perf_counter()
+        self.best_fitness = None
+        self.best_generation = 0
+
+    def check(self, generation: int, best_fitness: float, avg_fitness: float, chromosomes: np.ndarray, best_index: int) -> str | None:
+        """Return the stop reason after `generation`, or None to keep evolving."""
+        if self.best_fitness is None or best_fitness < self.best_fitness - self.min_improvement * abs(self.best_fitness):
+            self.best_fitness = best_fitness
+            self.best_generation = generation
+
+        if self.patience > 0 and generation - self.best_generation >= self.patience:
+            return PATIENCE
+
+        warmed_up = generation >= self.min_generations
+        if warmed_up and self.gap_threshold > 0 and (avg_fitness - best_fitness) / max(abs(best_fitness), 1e-12) < self.gap_threshold:
+            return FITNESS_GAP
+
+        if warmed_up and self.diversity_floor > 0 and population_diversity(chromosomes, best_index) < self.diversity_floor:
+            return DIVERSITY
+
+        if self.time_budget is not None and time.perf_counter() - self.start_time >= self.time_budget:
+            return TIME_BUDGET
+
+        return None
@@ -1,25 +1,54 @@
 from _encode_decode import encode_individual, decode_chromosome
-from a_generate_population import generate_population_coordinates
+from a_generate_population import generate_population_coordinates, generate_population_permutations
 from c_fitness import calculate_fitness
-from d_crossover import crossover
-from f_selection import select_next_generation, tournament_selection
-from e_mutation import light_mutation
-from address_routes.distribute_center import get_center_coordinates as depot_coords
-from delivery_setup.deliveries import load_deliveries_info as d_info
-from delivery_setup.vehicles import load_vehicles_info as v_info
+from c_parallel_fitness import ParallelFitnessEvaluator
+from c_fitness_cache import FitnessCache, chromosome_key
+from f_selection import select_next_generation_indices, tournament_indices
+from _population import Population
+from g_early_stopping import EarlyStopping, MAX_GENERATIONS
+from _rng import operator_streams
+from _profiling import PhaseProfiler, EVALUATION, STATISTICS, SELECTION, CROSSOVER, MUTATION
+from _observers import GenerationObserver, ConsoleLogger
+from _checkpoint import save_checkpoint, load_checkpoint, random_state_to_checkpoint, random_state_from_checkpoint
+from delivery_setup.problem_instance import ProblemInstance, load_problem_instance
 import matplotlib.pyplot as plt
+import numpy as np
+import random
+import copy
+import time
 
 class GeneticAlgorithm:
-    def __init__(self, city_code: str, max_generations: int, population_length: int, ratio_elitism: float, ratio_mutation: float, tournament_k: int):
+    def __init__(self, city_code: str, max_generations: int, population_length: int, ratio_elitism: float, ratio_mutation: float, tournament_k: int, instance: ProblemInstance = None, workers: int = 1, fitness_cache_size: int = 0, early_stopping: EarlyStopping = None, checkpoint_path: str = None, checkpoint_interval: int = 100, seed: int | np.random.SeedSequence = None, profiler: PhaseProfiler = None, observers: list[GenerationObserver] = None):
         self.city_code = city_code
         self.max_generations = max_generations
         self.population_length = population_length
         self.ratio_elitism = ratio_elitism
         self.ratio_mutation = ratio_mutation
         self.tournament_k = tournament_k
-        self.vehicles = v_info(self.city_code)
-        self.deliveries = d_info(self.city_code)
-        self.depot = depot_coords(self.city_code)
+        self.instance = instance if instance is not None else load_problem_instance(self.city_code)
+        self.vehicles = self.instance.vehicles
+        self.deliveries = self.instance.deliveries
+        self.depot = self.instance.depot
+        # Process-pool evaluation (workers > 1), created per run
+        self.workers = workers
+        self.parallel_evaluator = None
+        # LRU fitness memoization keyed by chromosome (0 disables it)
+        self.fitness_cache_size = fitness_cache_size
+        self.fitness_cache = None
+        # Convergence criteria (None runs all max_generations); own copy, as the criteria keep per-run state
+        self.early_stopping = copy.copy(early_stopping)
+        self.stop_reason = None
+        self.stop_generation = None
+        # Periodic .npz checkpoint of the run state (None disables it), see run(resume_from=...)
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        # Root seed of the run's RNG streams (None: drawn from `random`, so random.seed reproduces runs)
+        self.seed = seed
+        # Per-phase timing of each generation (None disables it); own copy, as it keeps per-run state
+        self.profiler = copy.copy(profiler)
+        self.timing_history = None
+        # Event sinks notified every generation, on improvement and at the end (default: progress every 100 generations)
+        self.observers = tuple(observers) if observers is not None else (ConsoleLogger(),)
 
     def initial_message(self):
         print(f"\n{'='*60}")
@@ -31,10 +60,11 @@ class GeneticAlgorithm:
         print(f"\n{'='*60}")
         print(f"Evolução Concluída!")
         print(f"{'='*60}")
+        print(f"Parada: {self.stop_reason} (geração {self.stop_generation})")
         print(f"Melhor solução encontrada na geração {self.best_overall['generation']}")
         print(f"Fitness: {self.best_overall['fitness']:.2f}")
         print(f"\nDecodificando melhor solução...")
-        self.best_routes = decode_chromosome(self.best_overall['chromosome'], self.deliveries, self.vehicles)
+        self.best_routes = decode_chromosome(self.best_overall['chromosome'], self.instance)
         total_deliveries = sum(len(route_deliveries) for _, route_deliveries in self.best_routes)
         print(f"Total de entregas: {len(self.best_overall['chromosome'])}")
         print(f"Entregas atribuídas: {total_deliveries}")
@@ -68,7 +98,9 @@ class GeneticAlgorithm:
         return {
             'generation': self.best_overall['generation'],
             'fitness': self.best_overall['fitness'],
-            'routes_metadata': routes_metadata
+            'routes_metadata': routes_metadata,
+            'stop_reason': self.stop_reason,
+            'stop_generation': self.stop_generation
         }
     
     def plot_fitness_evolution(self, save_path: str = None):
@@ -108,17 +140,192 @@ class GeneticAlgorithm:
             plt.savefig(save_path, dpi=300, bbox_inches='tight')
             print(f"Graph saved at: {save_path}")
         #plt.show()
+        plt.close()
 
-    def run(self, iterator: int) -> dict[str, any]:
-        initial_population = generate_population_coordinates(self.city_code, self.population_length)
+    def evaluate_population(self, population: Population):
+        # Only rows without a fitness value (NaN) are scored: every row after reproduction,
+        # none for a population already evaluated (e.g. after receiving migrants)
+        rows = np.flatnonzero(np.isnan(population.fitness))
+        if len(rows) == 0:
+            return
 
-        population = [
-            {"chromosome": encode_individual(ind), "fitness": None}
-            for ind in initial_population
-        ]
+        if self.fitness_cache is None:
+            if len(rows) == len(population):
+                population.fitness[:] = self.compute_fitness(population.chromosomes)
+            else:
+                population.fitness[rows] = self.compute_fitness(population.chromosomes[rows])
+            return
+
+        # Cached chromosomes skip both decoding and fitness; repeated misses are scored once
+        pending = {}
+        for index in rows.tolist():
+            key = chromosome_key(population.chromosomes[index])
+            if key in pending:
+                pending[key].append(index)
+                self.fitness_cache.hits += 1
+                continue
+
+            fitness = self.fitness_cache.get(key)
+            if fitness is None:
+                pending[key] = [index]
+            else:
+                population.fitness[index] = fitness
+
+        if not pending:
+            return
+
+        first_rows = [rows[0] for rows in pending.values()]
+        computed = self.compute_fitness(population.chromosomes[first_rows]).tolist()
+        for (key, rows), fitness in zip(pending.items(), computed):
+            self.fitness_cache.put(key, fitness)
+            population.fitness[rows] = fitness
+
+    def compute_fitness(self, chromosomes: np.ndarray) -> np.ndarray:
+        if self.parallel_evaluator is not None:
+            return self.parallel_evaluator.evaluate(chromosomes)
+
+        return np.array([
+            calculate_fitness(decode_chromosome(chromosome, self.instance), self.instance)
+            for chromosome in chromosomes.tolist()
+        ], dtype=np.float64)
+
+    def run(self, iterator: int, resume_from: str = None) -> dict[str, any]:
+        if self.workers > 1:
+            # Workers load the city instance once at startup (custom instances are shipped once)
+            is_city_instance = self.instance is load_problem_instance(self.city_code)
+            self.parallel_evaluator = ParallelFitnessEvaluator(
+                self.city_code if is_city_instance else self.instance,
+                workers=self.workers
+            )
+        try:
+            return self.evolve(iterator, resume_from)
+        finally:
+            if self.parallel_evaluator is not None:
+                self.parallel_evaluator.close()
+                self.parallel_evaluator = None
+
+    def evolve(self, iterator: int, resume_from: str = None) -> dict[str, any]:
+        if resume_from is None:
+            population, first_generation, finished = self.start_evolution(), 0, False
+        else:
+            population, first_generation, finished = self.load_checkpoint(resume_from)
+
+        if not finished:
+            for generation in range(first_generation, self.max_generations):
+                if not self.evolve_generation(population, generation):
+                    break
+                if self.checkpoint_path is not None and (generation + 1) % self.checkpoint_interval == 0:
+                    self.save_checkpoint(self.checkpoint_path, population, generation + 1)
+
+            if self.checkpoint_path is not None:
+                self.save_checkpoint(self.checkpoint_path, population, self.stop_generation + 1, finished=True)
+
+        return self.finish_evolution(iterator)
+
+    def save_checkpoint(self, path: str, population: Population, next_generation: int, finished: bool = False):
+        """
+        Save everything needed to continue the run exactly from `next_generation`: population
+        arrays, operator and selection generator states, history, best solution and stop
+        criteria. The fitness cache is not saved (a resumed run starts with an empty cache,
+        which changes its hit statistics but not the results).
+        """
+        random_words, random_metadata = random_state_to_checkpoint(self.rng.getstate())
+        early_stopping = None
+        if self.early_stopping is not None:
+            early_stopping = {
+                'best_fitness': self.early_stopping.best_fitness,
+                'best_generation': self.early_stopping.best_generation,
+                'elapsed': time.perf_counter() - self.early_stopping.start_time
+            }
+
+        arrays = {
+            'chromosomes': population.chromosomes,
+            'fitness': population.fitness,
+            'random_state': random_words,
+            'best_chromosome': np.asarray(self.best_overall['chromosome'], dtype=population.chromosomes.dtype),
+            **{f'history_{key}': np.asarray(values) for key, values in self.fitness_history.items()}
+        }
+        if self.timing_history is not None:
+            arrays.update({f'timing_{key}': np.asarray(values, dtype=np.int64) for key, values in self.timing_history.items()})
+        metadata = {
+            'city_code': self.city_code,
+            'population_length': self.population_length,
+            'next_generation': next_generation,
+            'finished': finished,
+            'stop_reason': self.stop_reason,
+            'stop_generation': self.stop_generation,
+            'best_generation': self.best_overall['generation'],
+            'best_fitness': self.best_overall['fitness'],
+            'random_state': random_metadata,
+            'selection_rng': self.selection_rng.bit_generator.state,
+            'cache_history': self.cache_history,
+            'early_stopping': early_stopping
+        }
+        save_checkpoint(path, arrays, metadata)
+
+    def load_checkpoint(self, path: str) -> tuple[Population, int, bool]:
+        """Restore a state written by save_checkpoint; returns (population, next generation, finished)."""
+        arrays, metadata = load_checkpoint(path)
+        if metadata['city_code'] != self.city_code or arrays['chromosomes'].shape[1] != self.instance.n_deliveries:
+            raise ValueError(f"Checkpoint {path} was written for a different problem instance.")
+
+        population = Population(arrays['chromosomes'], arrays['fitness'])
+        print(f"\nRetomando {self.city_code} a partir da geração {metadata['next_generation']} ({path})")
+
+        self.rng = random.Random()
+        self.rng.setstate(random_state_from_checkpoint(arrays['random_state'], metadata['random_state']))
+        self.selection_rng = np.random.default_rng()
+        self.selection_rng.bit_generator.state = metadata['selection_rng']
+
+        self.fitness_history = {key: arrays[f'history_{key}'].tolist() for key in ('generation', 'best', 'avg', 'worst')}
+        if self.profiler is not None:
+            self.profiler.start()
+            if 'timing_total' in arrays:  # absent when the checkpoint was written without profiling
+                for key, values in self.profiler.history.items():
+                    values.extend(arrays[f'timing_{key}'].tolist())
+            self.timing_history = self.profiler.history
+        self.best_overall = {
+            "generation": metadata['best_generation'],
+            "fitness": metadata['best_fitness'],
+            "chromosome": arrays['best_chromosome'].tolist()
+        }
+        self.fitness_cache = FitnessCache(self.fitness_cache_size) if self.fitness_cache_size > 0 else None
+        self.cache_history = metadata['cache_history']
+        self.stop_reason = metadata['stop_reason']
+        self.stop_generation = metadata['stop_generation']
+
+        if self.early_stopping is not None:
+            self.early_stopping.start()
+            state = metadata['early_stopping']
+            if state is not None:
+                self.early_stopping.best_fitness = state['best_fitness']
+                self.early_stopping.best_generation = state['best_generation']
+                self.early_stopping.start_time -= state['elapsed']
+
+        return population, metadata['next_generation'], metadata['finished']
+
+    def start_evolution(self) -> Population:
+        """Build the initial population and reset the run state (history, cache, stop criteria)."""
+        # Independent streams for the list-based operators and for the batched selection draws
+        self.rng, self.selection_rng = operator_streams(self.seed)
+        if self.instance.city == self.city_code:
+            initial_population = generate_population_coordinates(self.city_code, self.population_length, self.rng)
+            population = Population.from_chromosomes([encode_individual(ind) for ind in initial_population])
+        else:
+            # Custom instances (e.g. synthetic benchmarks) have no city route setup
+            population = Population.from_chromosomes(generate_population_permutations(self.instance.delivery_ids, self.population_length, self.rng))
 
         self.initial_message()
         self.best_overall = None
+        self.fitness_cache = FitnessCache(self.fitness_cache_size) if self.fitness_cache_size > 0 else None
+        self.cache_history = []
+        self.stop_reason = MAX_GENERATIONS
+        self.stop_generation = self.max_generations - 1
+        if self.early_stopping is not None:
+            self.early_stopping.start()
+        if self.profiler is not None:
+            self.profiler.start()
+            self.timing_history = self.profiler.history
         
         # Track fitness evolution
         self.fitness_history = {
@@ -128,65 +335,117 @@ class GeneticAlgorithm:
             'worst': []
         }
 
-        for generation in range(self.max_generations):
-
-            # Evaluate fitness
-            for ind in population:
-                routes = decode_chromosome(ind["chromosome"], self.deliveries, self.vehicles)
-                ind["fitness"] = calculate_fitness(routes, self.city_code)
-
-            # Statistics
-            fitness_values = [ind["fitness"] for ind in population]
-            best_fitness = min(fitness_values)
-            avg_fitness = sum(fitness_values) / len(fitness_values)
-            worst_fitness = max(fitness_values)
-            
-            # Save fitness history
-            self.fitness_history['generation'].append(generation)
-            self.fitness_history['best'].append(best_fitness)
-            self.fitness_history['avg'].append(avg_fitness)
-            self.fitness_history['worst'].append(worst_fitness)
-            
-            best_individual = min(population, key=lambda x: x["fitness"])
-            
-            if self.best_overall is None or best_fitness < self.best_overall["fitness"]:
-                self.best_overall = {
-                    "generation": generation,
-                    "fitness": best_fitness,
-                    "chromosome": best_individual["chromosome"]
-                }
-            
-            # Display progress
-            if generation % 100 == 0 or generation == self.max_generations - 1:
-                print(f"Geração {generation:3d} | Melhor: {best_fitness:.2f} | Média: {avg_fitness:.2f} | Pior: {worst_fitness:.2f}")
-
-            # Selection
-            selected = select_next_generation(
-                population,
-                pop_size=len(population),
-                elite_ratio=self.ratio_elitism,
-                tournament_k=self.tournament_k
-            )
+        return population
 
-            # Reproduction
-            offspring = []
+    def evolve_generation(self, population: Population, generation: int) -> bool:
+        """
+        Evaluate and record `generation`, then replace the population by the next one.
+        Returns False (population left evaluated) when a stopping criterion is met.
+        """
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.start_generation(generation)
 
-            while len(offspring) < len(population):
-                p1 = tournament_selection(selected)
-                p2 = tournament_selection(selected)
+        # Evaluate fitness
+        self.evaluate_population(population)
+        if self.fitness_cache is not None:
+            self.cache_history.append({'generation': generation, **self.fitness_cache.generation_stats()})
+        if profiler is not None:
+            profiler.lap(EVALUATION)
 
-                child_chrom = crossover(p1["chromosome"], p2["chromosome"], self.deliveries, self.vehicles, self.depot)
-                child_chrom = light_mutation(child_chrom, self.ratio_mutation)
+        # Statistics
+        best_index = population.best_index()
+        best_fitness = float(population.fitness[best_index])
+        avg_fitness = float(population.fitness.mean())
+        worst_fitness = float(population.fitness.max())
+        
+        # Save fitness history
+        self.fitness_history['generation'].append(generation)
+        self.fitness_history['best'].append(best_fitness)
+        self.fitness_history['avg'].append(avg_fitness)
+        self.fitness_history['worst'].append(worst_fitness)
+        
+        if self.best_overall is None or best_fitness < self.best_overall["fitness"]:
+            previous = self.best_overall
+            self.best_overall = {
+                "generation": generation,
+                "fitness": best_fitness,
+                "chromosome": population.chromosome(best_index)
+            }
+            for observer in self.observers:
+                observer.on_improvement({
+                    'generation': generation,
+                    'fitness': best_fitness,
+                    'previous': previous['fitness'] if previous is not None else None,
+                    'chromosome': self.best_overall['chromosome']
+                })
+        
+        stop_reason = None
+        if self.early_stopping is not None:
+            stop_reason = self.early_stopping.check(generation, best_fitness, avg_fitness, population.chromosomes, best_index)
+
+        # Report progress
+        if self.observers:
+            record = {
+                'generation': generation,
+                'best': best_fitness,
+                'avg': avg_fitness,
+                'worst': worst_fitness,
+                'best_overall': self.best_overall['fitness'],
+                'stop_reason': stop_reason,
+                'final': generation == self.max_generations - 1 or stop_reason is not None
+            }
+            if self.fitness_cache is not None:
+                record['cache'] = self.cache_history[-1]
+            for observer in self.observers:
+                observer.on_generation(record)
+
+        if profiler is not None:
+            profiler.lap(STATISTICS)
 
-                offspring.append({"chromosome": child_chrom, "fitness": None})
+        if stop_reason is not None:
+            self.stop_reason = stop_reason
+            self.stop_generation = generation
+            if profiler is not None:
+                profiler.end_generation()
+            return False
 
-            population = offspring
+        # Selection (in place, by index)
+        selected = select_next_generation_indices(
+            population.fitness,
+            pop_size=len(population),
+            elite_ratio=self.ratio_elitism,
+            tournament_k=self.tournament_k,
+            rng=self.selection_rng
+        )
+        population.select(selected)
 
+        # Reproduction: parents drawn by binary tournament over the selected pool
+        parents = tournament_indices(population.fitness, 2 * len(population), k=2, rng=self.selection_rng)
+        if profiler is not None:
+            profiler.lap(SELECTION)
+
+        population.crossover(parents.reshape(-1, 2), self.instance, rng=self.rng)
+        if profiler is not None:
+            profiler.lap(CROSSOVER)
+
+        population.mutate(self.ratio_mutation, self.rng)
+        if profiler is not None:
+            profiler.lap(MUTATION)
+            profiler.end_generation()
+        return True
+
+    def finish_evolution(self, iterator: int) -> dict[str, any]:
+        if self.profiler is not None:
+            self.profiler.finish()
         self.final_message()
         result = self.routes_summary()
         
         # Plot fitness evolution
         self.plot_fitness_evolution(save_path=f'fitness_balance/i{iterator}_fitness_evolution.png')
+
+        for observer in self.observers:
+            observer.on_finish(result)
         
         return result
 
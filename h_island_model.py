@@ -0,0 +1,249 @@
+import os
+import shutil
+import multiprocessing as mp
+import numpy as np
+from genetic_algorithm import GeneticAlgorithm
+from _rng import seed_sequence
+from _checkpoint import save_checkpoint, load_checkpoint
+
+# Migration topologies
+RING = "ring"
+RANDOM = "random"
+
+class Island:
+    """
+    One GeneticAlgorithm sub-population evolved epoch by epoch, with its own RNG streams
+    (spawned from the model's SeedSequence), so results do not depend on how the islands
+    are spread over processes.
+    """
+    def __init__(self, index: int, params: dict[str, any], seed: np.random.SeedSequence, resume_from: str = None):
+        self.index = index
+        self.ga = GeneticAlgorithm(**{**params, 'seed': seed})
+        self.population = None
+        self.generation = 0
+        self.finished = False
+        if resume_from is not None:
+            self.population, self.generation, self.finished = self.ga.load_checkpoint(resume_from)
+
+    def epoch(self, n_generations: int):
+        """Evolve up to `n_generations` generations, leaving the population evaluated unless finished."""
+        if self.population is None:
+            self.population = self.ga.start_evolution()
+
+        for _ in range(n_generations):
+            if self.generation >= self.ga.max_generations:
+                break
+            keep_going = self.ga.evolve_generation(self.population, self.generation)
+            self.generation += 1
+            if not keep_going:
+                self.generation = self.ga.max_generations
+                break
+
+        self.finished = self.generation >= self.ga.max_generations
+        if not self.finished:
+            self.ga.evaluate_population(self.population)
+
+    def emigrants(self, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Copies of the k best chromosomes and their fitness values."""
+        best = np.argsort(self.population.fitness, kind="stable")[:k]
+        return self.population.chromosomes[best].copy(), self.population.fitness[best].copy()
+
+    def immigrate(self, chromosomes: np.ndarray, fitness: np.ndarray):
+        """Replace the worst individuals by already evaluated migrants."""
+        k = min(len(chromosomes), len(self.population))
+        worst = np.argsort(self.population.fitness, kind="stable")[len(self.population) - k:]
+        self.population.chromosomes[worst] = chromosomes[:k]
+        self.population.fitness[worst] = fitness[:k]
+
+    def save(self, path: str):
+        """GA checkpoint of the island between epochs (population evaluated, migrants received)."""
+        self.ga.save_checkpoint(path, self.population, self.generation, finished=self.finished)
+
+    def finish(self) -> dict[str, any]:
+        return self.ga.finish_evolution(self.index)
+
+class IslandGroup:
+    """Islands hosted by one process; every method works on all of them and returns picklable data."""
+    def __init__(self, islands: list[tuple[int, dict[str, any], np.random.SeedSequence, str | None]]):
+        self.islands = {index: Island(index, params, seed, resume_from) for index, params, seed, resume_from in islands}
+
+    def epoch(self, n_generations: int, k: int) -> dict[int, tuple[np.ndarray, np.ndarray]]:
+        """Evolve the running islands; returns the emigrants of those still running afterwards."""
+        migrants = {}
+        for index, island in self.islands.items():
+            if not island.finished:
+                island.epoch(n_generations)
+                if not island.finished:
+                    migrants[index] = island.emigrants(k)
+        return migrants
+
+    def immigrate(self, arrivals: dict[int, list[tuple[np.ndarray, np.ndarray]]]):
+        for index, batches in arrivals.items():
+            island = self.islands[index]
+            if not island.finished:
+                island.immigrate(np.concatenate([c for c, _ in batches]), np.concatenate([f for _, f in batches]))
+
+    def save(self, directory: str):
+        for index, island in self.islands.items():
+            island.save(os.path.join(directory, f"i{index}.npz"))
+
+    def finish(self) -> dict[int, dict[str, any]]:
+        return {index: island.finish() for index, island in self.islands.items()}
+
+def island_worker(conn, islands: list[tuple[int, dict[str, any], np.random.SeedSequence, str | None]]):
+    # Each worker process renders its fitness plots with its own non-interactive backend
+    import matplotlib
+    matplotlib.use("Agg")
+
+    group = IslandGroup(islands)
+    while True:
+        try:
+            command, args = conn.recv()
+        except EOFError:
+            break  # Coordinator gone (error on another worker)
+        try:
+            conn.send((True, getattr(group, command)(*args)))
+        except Exception as error:
+            conn.send((False, error))
+        if command == "finish":
+            break
+    conn.close()
+
+class IslandModel:
+    """
+    Island-model GA: one GeneticAlgorithm per parameter set, evolving in up to `workers`
+    processes. Every `migration_interval` generations each running island sends copies of
+    its `migration_size` best chromosomes (compact integer arrays plus their fitness) to
+    the next running island (ring) or to a random one, where they replace the worst
+    individuals. Islands that stopped (max_generations or early stopping) leave the exchange.
+
+    With `checkpoint_dir`, every island is saved (GA checkpoint) after the migrations of
+    every `checkpoint_interval` generations (rounded down to whole migration epochs, at
+    least one) and at the end, into `checkpoint_dir/epoch{n}/i{index}.npz`; then
+    `checkpoint_dir/islands.npz` records the epoch and the migration RNG state, and older
+    epochs are removed, so an interrupted save leaves the previous checkpoint in use.
+    """
+    def __init__(self, islands_params: list[dict[str, any]], migration_interval: int = 50, migration_size: int = 2, topology: str = RING, workers: int = 1, seed: int | np.random.SeedSequence = None, checkpoint_dir: str = None, checkpoint_interval: int = 100):
+        if topology not in (RING, RANDOM):
+            raise ValueError(f"Unknown migration topology '{topology}'.")
+        if migration_interval < 1:
+            raise ValueError("migration_interval must be >= 1.")
+        self.islands_params = islands_params
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+        self.topology = topology
+        self.workers = max(1, min(workers, len(islands_params)))
+        self.seed = seed
+        self.checkpoint_dir = checkpoint_dir
+        self.checkpoint_epochs = max(1, checkpoint_interval // migration_interval)
+
+    def migration_targets(self, senders: list[int], rng: np.random.Generator) -> dict[int, int]:
+        if len(senders) < 2:
+            return {}
+        if self.topology == RING:
+            return {sender: senders[(k + 1) % len(senders)] for k, sender in enumerate(senders)}
+
+        targets = {}
+        for k, sender in enumerate(senders):
+            other = int(rng.integers(len(senders) - 1))
+            targets[sender] = senders[other + (other >= k)]
+        return targets
+
+    def save_model_checkpoint(self, directory: str, epoch: int, migration_rng: np.random.Generator):
+        """Point the model checkpoint at the islands saved for `epoch` and drop the older epochs."""
+        metadata = {
+            'epoch': epoch,
+            'n_islands': len(self.islands_params),
+            'migration_interval': self.migration_interval,
+            'migration_rng': migration_rng.bit_generator.state
+        }
+        save_checkpoint(os.path.join(directory, "islands.npz"), {}, metadata)
+        for name in os.listdir(directory):
+            if name.startswith("epoch") and name != f"epoch{epoch}":
+                shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+
+    def run(self, resume_from: str = None) -> list[dict[str, any]]:
+        """
+        Evolve every island to completion; returns each island's GA metadata, in island order.
+        `resume_from` is the checkpoint directory of an interrupted run (also used for new
+        checkpoints when `checkpoint_dir` is not given); the run continues exactly as the
+        uninterrupted one would.
+        """
+        # One independent stream per island plus one for the random topology
+        *island_seeds, migration_seed = seed_sequence(self.seed).spawn(len(self.islands_params) + 1)
+        migration_rng = np.random.default_rng(migration_seed)
+        checkpoint_dir = self.checkpoint_dir if self.checkpoint_dir is not None else resume_from
+
+        epoch = 0
+        resume_paths = [None] * len(self.islands_params)
+        if resume_from is not None:
+            _, metadata = load_checkpoint(os.path.join(resume_from, "islands.npz"))
+            if metadata['n_islands'] != len(self.islands_params) or metadata['migration_interval'] != self.migration_interval:
+                raise ValueError(f"Checkpoint {resume_from} was written for a different island model.")
+            epoch = metadata['epoch']
+            migration_rng.bit_generator.state = metadata['migration_rng']
+            resume_paths = [os.path.join(resume_from, f"epoch{epoch}", f"i{index}.npz") for index in range(len(self.islands_params))]
+
+        islands = [(index, params, island_seeds[index], resume_paths[index]) for index, params in enumerate(self.islands_params)]
+        assignments = [islands[w::self.workers] for w in range(self.workers)]
+
+        pipes, processes = [], []
+        if self.workers == 1:
+            group = IslandGroup(islands)
+
+            def call(command: str, group_args: list[tuple]) -> list:
+                return [getattr(group, command)(*group_args[0])]
+        else:
+            for assigned in assignments:
+                parent_conn, child_conn = mp.Pipe()
+                process = mp.Process(target=island_worker, args=(child_conn, assigned), daemon=True)
+                process.start()
+                pipes.append(parent_conn)
+                processes.append(process)
+
+            def call(command: str, group_args: list[tuple]) -> list:
+                for conn, args in zip(pipes, group_args):
+                    conn.send((command, args))
+                replies = [conn.recv() for conn in pipes]
+                for ok, value in replies:
+                    if not ok:
+                        raise value
+                return [value for _, value in replies]
+
+        def checkpoint(epoch: int):
+            epoch_dir = os.path.join(checkpoint_dir, f"epoch{epoch}")
+            os.makedirs(epoch_dir, exist_ok=True)
+            call("save", [(epoch_dir,)] * self.workers)
+            self.save_model_checkpoint(checkpoint_dir, epoch, migration_rng)
+
+        owner = {index: w for w, assigned in enumerate(assignments) for index, _, _, _ in assigned}
+        try:
+            while True:
+                migrants = {}
+                for group_migrants in call("epoch", [(self.migration_interval, self.migration_size)] * self.workers):
+                    migrants.update(group_migrants)
+                epoch += 1
+                if not migrants:
+                    break
+
+                arrivals = [{} for _ in assignments]
+                for sender, target in self.migration_targets(sorted(migrants), migration_rng).items():
+                    arrivals[owner[target]].setdefault(target, []).append(migrants[sender])
+                call("immigrate", [(group_arrivals,) for group_arrivals in arrivals])
+                if checkpoint_dir is not None and epoch % self.checkpoint_epochs == 0:
+                    checkpoint(epoch)
+
+            if checkpoint_dir is not None:
+                checkpoint(epoch)
+
+            results = {}
+            for group_results in call("finish", [()] * self.workers):
+                results.update(group_results)
+            return [results[index] for index in range(len(islands))]
+        finally:
+            for conn in pipes:
+                conn.close()
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
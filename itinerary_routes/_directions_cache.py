@@ -0,0 +1,98 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+class DirectionsCacheMiss(LookupError):
+    """Raised in offline mode when a request is not in the cache."""
+
+def directions_key(origin: tuple[float, float], destination: tuple[float, float], waypoints: list[tuple[float, float]] = None, mode: str = "driving", precision: int = 6) -> str:
+    """
+    Content address of a directions request: SHA-256 of the coordinates rounded to
+    `precision` decimals (6 ~ 0.1 m) and the travel mode.
+    """
+    rounded = lambda point: [round(float(point[0]), precision), round(float(point[1]), precision)]
+    request = {
+        'origin': rounded(origin),
+        'destination': rounded(destination),
+        'waypoints': [rounded(point) for point in waypoints or ()],
+        'mode': mode
+    }
+    return hashlib.sha256(json.dumps(request, separators=(",", ":")).encode()).hexdigest()
+
+class DirectionsCache:
+    """
+    SQLite store of Directions API responses (zlib-compressed JSON) keyed by directions_key.
+    Entries older than `ttl` seconds are treated as missing; when the stored payloads exceed
+    `max_bytes`, the least recently read entries are evicted. Safe to share between threads.
+    """
+    def __init__(self, path: str | Path, ttl: float = 7 * 24 * 3600, max_bytes: int = 64 * 1024 * 1024):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS directions (
+                key TEXT PRIMARY KEY,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL,
+                size INTEGER NOT NULL,
+                payload BLOB NOT NULL
+            )
+        """)
+        self.connection.commit()
+
+    def get(self, key: str) -> list[dict] | None:
+        now = time.time()
+        with self.lock:
+            row = self.connection.execute("SELECT created, payload FROM directions WHERE key = ?", (key,)).fetchone()
+            if row is None or (self.ttl is not None and now - row[0] > self.ttl):
+                self.misses += 1
+                return None
+            self.connection.execute("UPDATE directions SET accessed = ? WHERE key = ?", (now, key))
+            self.connection.commit()
+            self.hits += 1
+        return json.loads(zlib.decompress(row[1]))
+
+    def put(self, key: str, directions: list[dict]):
+        payload = zlib.compress(json.dumps(directions, separators=(",", ":")).encode(), level=6)
+        now = time.time()
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO directions (key, created, accessed, size, payload) VALUES (?, ?, ?, ?, ?)",
+                (key, now, now, len(payload), payload)
+            )
+            self.evict()
+            self.connection.commit()
+
+    def evict(self):
+        """Drop expired entries, then the least recently read ones above max_bytes (lock held)."""
+        if self.ttl is not None:
+            self.connection.execute("DELETE FROM directions WHERE created < ?", (time.time() - self.ttl,))
+        total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM directions").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = []
+        for key, size in self.connection.execute("SELECT key, size FROM directions ORDER BY accessed"):
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self.connection.executemany("DELETE FROM directions WHERE key = ?", evicted)
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM directions").fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
@@ -0,0 +1,183 @@
+import hashlib
+import os
+import re
+import threading
+from io import BytesIO
+from pathlib import Path
+from urllib.parse import urlparse
+import requests
+from PIL import Image
+from staticmap import StaticMap
+
+DEFAULT_TILE_DIR = Path(__file__).parent / "cache" / "tiles"
+DEFAULT_TILE_URL = "http://a.tile.osm.org/{z}/{x}/{y}.png"
+
+def blank_tile(tile_size: int = 256) -> bytes:
+    """Transparent PNG drawn in place of tiles missing in offline mode."""
+    buffer = BytesIO()
+    Image.new("RGBA", (tile_size, tile_size), (0, 0, 0, 0)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+class TileCache:
+    """
+    Persistent map tile store shared by every render: `root/<source>/z/x/y.png`, one source
+    directory per URL template. Downloads reuse one HTTP session per thread, and a tile
+    requested by several threads at once is downloaded by the first one only; reads refresh
+    the file time, and once the stored tiles exceed `max_bytes` the least recently used are
+    removed. With `offline` (or MAP_TILES_OFFLINE=1) only cached tiles are served.
+    """
+    def __init__(self, root: str | Path = DEFAULT_TILE_DIR, max_bytes: int = 256 * 1024 * 1024, offline: bool = None, timeout: float = 10.0, headers: dict[str, str] = None):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.offline = offline if offline is not None else os.getenv("MAP_TILES_OFFLINE") == "1"
+        self.timeout = timeout
+        self.headers = headers or {"User-Agent": "StaticMap"}
+        self.local = threading.local()
+        self.hits = 0
+        self.downloads = 0
+        self.missing = 0
+        self.lock = threading.Lock()
+        self.in_flight = {}  # tile path -> Event set when its download ends
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.total_bytes = sum(path.stat().st_size for path in self.root.rglob("*.png"))
+
+    @property
+    def session(self) -> requests.Session:
+        """HTTP session of the calling thread (requests.Session is not thread-safe)."""
+        session = getattr(self.local, "session", None)
+        if session is None:
+            session = self.local.session = requests.Session()
+            session.headers.update(self.headers)
+        return session
+
+    def source_dir(self, url_template: str) -> Path:
+        host = urlparse(url_template).hostname or "local"
+        return self.root / f"{host}-{hashlib.sha1(url_template.encode()).hexdigest()[:8]}"
+
+    def tile_path(self, url_template: str, z: int, x: int, y: int) -> Path:
+        return self.source_dir(url_template) / str(z) / str(x) / f"{y}.png"
+
+    def get(self, url_template: str, z: int, x: int, y: int) -> bytes | None:
+        """Tile bytes from disk or, on a miss (online only), downloaded and stored; None if unavailable."""
+        path = self.tile_path(url_template, z, x, y)
+        try:
+            content = path.read_bytes()
+        except FileNotFoundError:
+            content = None
+
+        if content is not None:
+            try:
+                os.utime(path)  # Most recently used
+            except FileNotFoundError:
+                pass  # Evicted after the read; the bytes read are still the tile
+            with self.lock:
+                self.hits += 1
+            return content
+
+        if self.offline:
+            with self.lock:
+                self.missing += 1
+            return None
+
+        # One download per tile: other threads wait for it and read the stored file
+        with self.lock:
+            download = self.in_flight.get(path)
+            owner = download is None
+            if owner:
+                download = self.in_flight[path] = threading.Event()
+        if not owner:
+            download.wait()
+            try:
+                return path.read_bytes()
+            except FileNotFoundError:
+                return None  # The download failed (or the tile was evicted meanwhile)
+
+        try:
+            # Another thread may have stored the tile between our miss and taking ownership
+            try:
+                content = path.read_bytes()
+            except FileNotFoundError:
+                content = None
+            if content is not None:
+                with self.lock:
+                    self.hits += 1
+                return content
+
+            response = self.session.get(url_template.format(z=z, x=x, y=y), timeout=self.timeout)
+            if response.status_code != 200:
+                return None
+            self.put(path, response.content)
+            return response.content
+        finally:
+            with self.lock:
+                del self.in_flight[path]
+            download.set()
+
+    def put(self, path: Path, content: bytes):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(content)
+        with self.lock:
+            # A tile stored again (e.g. by another process sharing the directory) replaces its size
+            try:
+                previous = path.stat().st_size
+            except FileNotFoundError:
+                previous = 0
+            os.replace(tmp_path, path)
+            self.downloads += 1
+            self.total_bytes += len(content) - previous
+            if self.total_bytes > self.max_bytes:
+                self.evict()
+
+    def evict(self):
+        """Remove the least recently used tiles down to 90% of max_bytes (lock held), so the scan is not repeated on every download."""
+        target = 0.9 * self.max_bytes
+        tiles = []
+        for path in self.root.rglob("*.png"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # Removed meanwhile (e.g. by another process sharing the directory)
+            tiles.append((stat.st_mtime, stat.st_size, path))
+
+        tiles.sort(key=lambda tile: tile[0])
+        for _, size, path in tiles:
+            if self.total_bytes <= target:
+                break
+            path.unlink(missing_ok=True)
+            self.total_bytes -= size
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+def shared_tile_cache() -> TileCache:
+    """Process-wide TileCache at DEFAULT_TILE_DIR, created on first use."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = TileCache()
+        return _shared_cache
+
+class CachedStaticMap(StaticMap):
+    """StaticMap whose tile requests go through a TileCache; offline misses render as blank tiles."""
+    def __init__(self, width: int, height: int, tile_cache: TileCache, url_template: str = DEFAULT_TILE_URL, **kwargs):
+        super().__init__(width, height, url_template=url_template, **kwargs)
+        self.tile_cache = tile_cache
+        # Recover z/x/y from the URLs StaticMap builds from the template
+        pattern = re.escape(url_template)
+        for name in ("z", "x", "y"):
+            pattern = pattern.replace(re.escape(f"{{{name}}}"), f"(?P<{name}>\\d+)")
+        self.url_pattern = re.compile(f"^{pattern}$")
+
+    def get(self, url: str, **kwargs) -> tuple[int, bytes]:
+        tile = self.url_pattern.match(url)
+        if tile is None:
+            return super().get(url, **kwargs)
+
+        content = self.tile_cache.get(self.url_template, int(tile["z"]), int(tile["x"]), int(tile["y"]))
+        if content is None:
+            if self.tile_cache.offline:
+                return 200, blank_tile(self.tile_size)
+            return 404, None
+        return 200, content
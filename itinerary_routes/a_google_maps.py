@@ -1,20 +1,77 @@
 import googlemaps
 import os
+from pathlib import Path
 from dotenv import load_dotenv
+from itinerary_routes._directions_cache import DirectionsCache, DirectionsCacheMiss, directions_key
 load_dotenv()
 
+DEFAULT_CACHE_PATH = Path(__file__).parent / "cache" / "directions.sqlite"
+
+class SingleAttemptClient(googlemaps.Client):
+    """
+    googlemaps.Client without internal retries, for callers with their own retry policy:
+    OVER_QUERY_LIMIT raises its ApiError at once and a 5xx response (which the stock
+    client retries for up to `retry_timeout`) raises TransportError.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, retry_over_query_limit=False, **kwargs)
+
+    def _request(self, url, params, first_request_time=None, retry_counter=0, *args, **kwargs):
+        if retry_counter > 0:
+            raise googlemaps.exceptions.TransportError("Server error (HTTP 5xx); retries are left to the caller.")
+        return super()._request(url, params, first_request_time, retry_counter, *args, **kwargs)
+
 
 class GoogleMapsAPI:
-    def __init__(self):
+    """
+    Directions API client backed by a persistent DirectionsCache: a request already answered
+    (same rounded origin, destination, waypoints and mode) within `cache_ttl` seconds is
+    served from disk. `cache_path=None` disables the cache; `offline=True` (or the
+    GOOGLE_MAPS_OFFLINE=1 environment variable) serves only from the cache and raises
+    DirectionsCacheMiss otherwise, without an API key or network access. `base_url` points
+    the client at another server (e.g. a local stub replaying recorded responses).
+    `client_retries=False` turns off googlemaps' own retries (see SingleAttemptClient).
+    """
+    def __init__(self, cache_path: str | Path = DEFAULT_CACHE_PATH, cache_ttl: float = 7 * 24 * 3600, cache_max_bytes: int = 64 * 1024 * 1024, offline: bool = None, base_url: str = None, client_retries: bool = True):
+        self.offline = offline if offline is not None else os.getenv("GOOGLE_MAPS_OFFLINE") == "1"
+        if self.offline and cache_path is None:
+            raise ValueError("Offline mode requires a directions cache.")
+        self.cache = DirectionsCache(cache_path, cache_ttl, cache_max_bytes) if cache_path is not None else None
+
         self.GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY")
-        self.client = googlemaps.Client(key=self.GOOGLE_MAPS_API_KEY)
+        self.base_url = base_url
+        self.client = None
+        self.set_client_retries(client_retries)
+
+    def set_client_retries(self, enabled: bool):
+        """Rebuild the client with (stock googlemaps.Client) or without (SingleAttemptClient) internal retries."""
+        self.client_retries = enabled
+        if not self.offline:
+            client_kwargs = {'base_url': self.base_url} if self.base_url is not None else {}
+            client_class = googlemaps.Client if enabled else SingleAttemptClient
+            self.client = client_class(key=self.GOOGLE_MAPS_API_KEY, **client_kwargs)
+
+    def cached_directions(self, origin: tuple[float, float],
+                          destination: tuple[float, float],
+                          waypoints: list[tuple[float, float]] = None,
+                          mode: str = "driving"
+                          ) -> dict | None:
+        """Cached response of the request, or None (no network access)."""
+        if self.cache is None:
+            return None
+        return self.cache.get(directions_key(origin, destination, waypoints, mode))
 
     def get_directions(self, origin: tuple[float, float], 
                        destination: tuple[float, float], 
                        waypoints: list[tuple[float, float]] = None, 
                        mode: str = "driving"
                        ) -> dict:
-        
+        directions = self.cached_directions(origin, destination, waypoints, mode)
+        if directions is not None:
+            return directions
+        if self.offline:
+            raise DirectionsCacheMiss(f"Directions {origin} -> {destination} ({len(waypoints or ())} waypoints) not cached (offline mode).")
+
         directions = self.client.directions(
             origin=origin,
             destination=destination,
@@ -23,8 +80,19 @@ class GoogleMapsAPI:
             optimize_waypoints=False,
             departure_time="now"
         )
+        if self.cache is not None and directions:
+            self.cache.put(directions_key(origin, destination, waypoints, mode), directions)
         return directions
 
+    def get_distance_matrix(self, origins: list[tuple[float, float]],
+                            destinations: list[tuple[float, float]],
+                            mode: str = "driving"
+                            ) -> dict:
+        """Distance Matrix API response (not cached; used offline to build road matrices)."""
+        if self.offline:
+            raise DirectionsCacheMiss("The Distance Matrix API is not available in offline mode.")
+        return self.client.distance_matrix(origins=origins, destinations=destinations, mode=mode, units="metric")
+
 
 if __name__ == "__main__":
     gmaps_api = GoogleMapsAPI()
@@ -1,64 +1,92 @@
-import polyline
+import numpy as np
 
-class PolylineDesigner:
-    def __init__(self, directions: dict):
-        self.directions = directions
+def decode_polylines(encoded: list[str], precision: int = 5) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Decode several encoded polylines in one vectorized pass.
 
-    def extract_coordinates_with_onecolor(self):
-        coords = []
-        leg_start_points = []
+    Returns a (P, 2) float64 array of (lat, lon) points with the polylines back to back and
+    the offsets (len(encoded) + 1) of each polyline in it. Values are accumulated as integers
+    and divided by 10**precision, exactly like polyline.decode.
+    """
+    lengths = np.fromiter((len(e) for e in encoded), dtype=np.int64, count=len(encoded))
+    chunks = np.frombuffer("".join(encoded).encode("ascii"), dtype=np.uint8).astype(np.int64) - 63
+    if len(chunks) == 0:
+        return np.empty((0, 2), dtype=np.float64), np.zeros(len(encoded) + 1, dtype=np.int64)
 
-        for leg in self.directions[0]['legs']:
-            leg_start_points.append((
-                leg['start_location']['lat'],
-                leg['start_location']['lng']
-            ))
+    # Each value is a run of 5-bit chunks ending at the first chunk without the 0x20 flag
+    ends = (chunks & 0x20) == 0
+    if not ends[-1]:
+        raise ValueError("Truncated polyline.")
+    value_ends = np.cumsum(ends)
+    starts = np.flatnonzero(np.concatenate(([True], ends[:-1])))
+    position = np.arange(len(chunks)) - starts[value_ends - ends]
+    values = np.add.reduceat((chunks & 0x1f) << (5 * position), starts)
+    deltas = np.where(values & 1, ~(values >> 1), values >> 1).reshape(-1, 2)
 
-            for step in leg['steps']:
-                decoded = polyline.decode(step['polyline']['points'])
+    # Points per polyline, from the number of values completed up to its last character
+    boundaries = np.cumsum(lengths)
+    completed = np.where(boundaries > 0, value_ends[np.maximum(boundaries, 1) - 1], 0)
+    offsets = np.concatenate(([0], completed // 2))
 
-                if coords and decoded[0] == coords[-1]:
-                    decoded = decoded[1:]
+    # Running sums restart at every polyline (its first point is absolute)
+    absolute = np.cumsum(deltas, axis=0)
+    base = np.vstack(([[0, 0]], absolute))[offsets[:-1]]
+    absolute -= np.repeat(base, np.diff(offsets), axis=0)
+    return absolute / float(10 ** precision), offsets
 
-                coords.extend(decoded)
+def is_multileg(coords) -> bool:
+    """True for per-leg coordinates (list of legs), False for a single polyline."""
+    return isinstance(coords, list) and len(coords) > 0 and np.ndim(coords[0]) == 2
 
+class PolylineDesigner:
+    """
+    Turns a Directions API response into coordinate arrays: every step polyline of every leg
+    is decoded at once into one float64 (lat, lon) array, and legs are views into it
+    delimited by offsets.
+    """
+    def __init__(self, directions: dict):
+        self.directions = directions
+
+    def leg_start_points(self) -> list[tuple[float, float]]:
+        legs = self.directions[0]['legs']
+        points = [(leg['start_location']['lat'], leg['start_location']['lng']) for leg in legs]
         # Last leg end point
-        leg_start_points.append((
-            self.directions[0]['legs'][-1]['end_location']['lat'],
-            self.directions[0]['legs'][-1]['end_location']['lng']
-        ))
+        points.append((legs[-1]['end_location']['lat'], legs[-1]['end_location']['lng']))
+        return points
 
-        return coords, leg_start_points
-    
-    def extract_coordinates_with_multicolors(self):
-        """Extract coordinates separated by legs for multi-colored routes"""
-        legs_coords = []
-        leg_start_points = []
+    def decode_legs(self, join_legs: bool) -> tuple[np.ndarray, np.ndarray]:
+        """
+        All points of the route and the offsets of each leg in them. A step that starts where
+        the previous one ended drops its repeated first point; with `join_legs` the first step
+        of each leg is also compared with the end of the previous leg.
+        """
+        legs = self.directions[0]['legs']
+        steps = [step['polyline']['points'] for leg in legs for step in leg['steps']]
+        steps_per_leg = np.array([len(leg['steps']) for leg in legs], dtype=np.int64)
+        points, step_offsets = decode_polylines(steps)
 
-        for leg in self.directions[0]['legs']:
-            leg_start_points.append((
-                leg['start_location']['lat'],
-                leg['start_location']['lng']
-            ))
-            
-            leg_coords = []
-            for step in leg['steps']:
-                decoded = polyline.decode(step['polyline']['points'])
-                
-                if leg_coords and decoded[0] == leg_coords[-1]:
-                    decoded = decoded[1:]
-                
-                leg_coords.extend(decoded)
-            
-            legs_coords.append(leg_coords)
+        keep = np.ones(len(points), dtype=bool)
+        starts = step_offsets[:-1]
+        comparable = starts > 0
+        if not join_legs:
+            comparable[np.cumsum(steps_per_leg)[:-1]] = False  # First step of each leg
+            comparable[0] = False
+        candidates = starts[comparable]
+        keep[candidates] = np.any(points[candidates] != points[candidates - 1], axis=1)
 
-        # Last point (end)
-        leg_start_points.append((
-            self.directions[0]['legs'][-1]['end_location']['lat'],
-            self.directions[0]['legs'][-1]['end_location']['lng']
-        ))
+        kept = np.concatenate(([0], np.cumsum(keep)))
+        leg_offsets = kept[step_offsets[np.concatenate(([0], np.cumsum(steps_per_leg)))]]
+        return points[keep], leg_offsets
 
-        return legs_coords, leg_start_points
+    def extract_coordinates_with_onecolor(self) -> tuple[np.ndarray, list[tuple[float, float]]]:
+        points, _ = self.decode_legs(join_legs=True)
+        return points, self.leg_start_points()
+
+    def extract_coordinates_with_multicolors(self) -> tuple[list[np.ndarray], list[tuple[float, float]]]:
+        """Extract coordinates separated by legs for multi-colored routes (views of one array)"""
+        points, leg_offsets = self.decode_legs(join_legs=False)
+        legs_coords = [points[start:end] for start, end in zip(leg_offsets[:-1], leg_offsets[1:])]
+        return legs_coords, self.leg_start_points()
 
 if __name__ == "__main__":
     from a_google_maps import GoogleMapsAPI
@@ -72,4 +100,3 @@ if __name__ == "__main__":
     coords, leg_starts = poly_designer.extract_coordinates_with_onecolor()
     print("Coordinates:", coords)
     print("Leg Start Points:", leg_starts)
-
@@ -1,9 +1,11 @@
 import folium
+import numpy as np
 from pathlib import Path
 from itinerary_routes._solution_type import SolutionMethod
+from itinerary_routes.b_polyline_designer import is_multileg
 
 class FoliumPath:
-    def __init__(self, coords: list[tuple[float, float]] | list[list[tuple[float, float]]], leg_start_points: list[tuple[float, float]], iterator: int = 0, generation: int = 0, route_id: int = 0):
+    def __init__(self, coords: np.ndarray | list[np.ndarray], leg_start_points: list[tuple[float, float]], iterator: int = 0, generation: int = 0, route_id: int = 0):
         self.coords = coords
         self.leg_start_points = leg_start_points
         self.iterator = iterator
@@ -24,10 +26,11 @@ class FoliumPath:
     
     def create_html_map(self, solution_method: SolutionMethod):
         # Define initial location for centering the map
-        if isinstance(self.coords[0], list):
-            initial_location = self.coords[0][0]
+        multileg = is_multileg(self.coords)
+        if multileg:
+            initial_location = list(self.coords[0][0])
         else:
-            initial_location = self.coords[0]
+            initial_location = list(self.coords[0])
         
         m = folium.Map(
             location=initial_location,
@@ -36,20 +39,20 @@ class FoliumPath:
         )
 
         # Draw each segment with a different color
-        if isinstance(self.coords[0], list):
-            # Coords is a list of lists (one segment per leg)
+        if multileg:
+            # Coords is a list of (lat, lon) arrays (one segment per leg)
             for i, leg_coords in enumerate(self.coords):
                 color = self.color_palette[i % len(self.color_palette)]
                 folium.PolyLine(
-                    leg_coords,
+                    np.asarray(leg_coords).tolist(),
                     color=color,
                     weight=4,
                     opacity=0.9
                 ).add_to(m)
         else:
-            # Coords is a single list (draw one line)
+            # Coords is a single (lat, lon) array (draw one line)
             folium.PolyLine(
-                self.coords,
+                np.asarray(self.coords).tolist(),
                 weight=4,
                 opacity=0.9
             ).add_to(m)
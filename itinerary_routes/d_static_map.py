@@ -1,14 +1,19 @@
 from itinerary_routes._solution_type import SolutionMethod
-from staticmap import StaticMap, Line, CircleMarker
+from itinerary_routes.b_polyline_designer import is_multileg
+from itinerary_routes._tile_cache import TileCache, CachedStaticMap, shared_tile_cache
+from staticmap import Line, CircleMarker
 from pathlib import Path
+import numpy as np
 
 class StaticMapRoute:
-    def __init__(self, coords: list[tuple[float, float]] | list[list[tuple[float, float]]], leg_start_points: list[tuple[float, float]], iterator: int = 0, generation: int = 0, route_id: int = 0):
+    def __init__(self, coords: np.ndarray | list[np.ndarray], leg_start_points: list[tuple[float, float]], iterator: int = 0, generation: int = 0, route_id: int = 0, tile_cache: TileCache = None):
         self.coords = coords
         self.leg_start_points = leg_start_points
         self.iterator = iterator
         self.generation = generation
         self.route_id = route_id
+        # Tiles come from the on-disk cache shared by every render (downloaded only once)
+        self.tile_cache = tile_cache if tile_cache is not None else shared_tile_cache()
         self.color_palette = ['red', 'orange', 'yellow', 'green', 'blue', 'purple', 'pink', 'brown', 'gray', 'black', 'cyan', 'magenta']
 
     def png_path(self, solution_method: SolutionMethod) -> str:
@@ -24,19 +29,18 @@ class StaticMapRoute:
     
     def create_static_map(self, solution_method: SolutionMethod):
         png_path = self.png_path(solution_method)
-        map_image = StaticMap(1200, 800, url_template='http://a.tile.osm.org/{z}/{x}/{y}.png')
+        map_image = CachedStaticMap(1200, 800, self.tile_cache, url_template='http://a.tile.osm.org/{z}/{x}/{y}.png')
 
         # Draw each segment with a different color
-        if isinstance(self.coords[0], list):
-            # Coords is a list of lists (one segment per leg)
+        # staticmap takes (lon, lat): the column flip is a view, converted to lists in one call
+        if is_multileg(self.coords):
+            # Coords is a list of (lat, lon) arrays (one segment per leg)
             for i, leg_coords in enumerate(self.coords):
                 color = self.color_palette[i % len(self.color_palette)]
-                line_coords = [(lon, lat) for lat, lon in leg_coords]
-                map_image.add_line(Line(line_coords, color, 3))
+                map_image.add_line(Line(np.asarray(leg_coords)[:, ::-1].tolist(), color, 3))
         else:
-            # Coords is a single list (draw one line)
-            line_coords = [(lon, lat) for lat, lon in self.coords]
-            map_image.add_line(Line(line_coords, 'blue', 3))
+            # Coords is a single (lat, lon) array (draw one line)
+            map_image.add_line(Line(np.asarray(self.coords)[:, ::-1].tolist(), 'blue', 3))
 
         # Add markers for leg start points
         num_points = len(self.leg_start_points)
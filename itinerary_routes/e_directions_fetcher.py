@@ -0,0 +1,117 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, Iterator
+import googlemaps.exceptions
+from itinerary_routes._directions_cache import directions_key
+
+def is_transient(error: Exception) -> bool:
+    """Network failures, timeouts and server-side/quota API errors are worth retrying."""
+    if isinstance(error, (googlemaps.exceptions.TransportError, googlemaps.exceptions.Timeout)):
+        return True
+    return isinstance(error, googlemaps.exceptions.ApiError) and error.status in ("OVER_QUERY_LIMIT", "UNKNOWN_ERROR")
+
+class RateLimiter:
+    """Spaces calls at least 1 / `requests_per_second` apart across threads (None: no limit)."""
+    def __init__(self, requests_per_second: float = None):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        if self.interval == 0.0:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+def solution_route_requests(solution: dict[str, any], solution_method, delivery_data: dict[int, dict], depot: tuple[float, float]) -> list[dict[str, any]]:
+    """One directions request per route of a solution: depot -> deliveries (in route order) -> depot."""
+    return [
+        {
+            'origin': depot,
+            'destination': depot,
+            'waypoints': [(delivery_data[int(delivery[0])]['lat'], delivery_data[int(delivery[0])]['lon']) for delivery in deliveries],
+            'solution': solution,
+            'solution_method': solution_method,
+            'route_id': route_id
+        }
+        for route_id, deliveries in solution['routes_metadata'].items()
+    ]
+
+class DirectionsFetcher:
+    """
+    Fetches the directions of many routes concurrently through a GoogleMapsAPI (or any
+    object with its `cached_directions`/`get_directions` methods, e.g. one pointed at a
+    local stub server). With `retries`, the fetcher is the only retry layer: it turns off
+    the googlemaps client's own retries (5xx and OVER_QUERY_LIMIT), so a failing request
+    waits at most the backoff below and every attempt goes through the rate limiter.
+
+    Args:
+        api: Directions client; cached responses are served first without using a thread.
+        max_workers: Maximum number of requests in flight.
+        requests_per_second: Rate limit shared by all workers (None disables it).
+        retries: Extra attempts for transient errors (see is_transient).
+        backoff: Delay before the first retry, doubled at each attempt up to `max_backoff`
+            and jittered so retrying workers do not hit the API in lockstep.
+    """
+    def __init__(self, api, max_workers: int = 8, requests_per_second: float = 10.0, retries: int = 3, backoff: float = 0.5, max_backoff: float = 8.0):
+        self.api = api
+        if retries > 0 and getattr(api, 'client_retries', False):
+            api.set_client_retries(False)
+        self.max_workers = max_workers
+        self.rate_limiter = RateLimiter(requests_per_second)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.failures = []
+        self.retried = 0
+
+    def fetch(self, request: dict[str, any]) -> list[dict]:
+        for attempt in range(self.retries + 1):
+            self.rate_limiter.wait()
+            try:
+                return self.api.get_directions(request['origin'], request['destination'], request['waypoints'], request.get('mode', 'driving'))
+            except Exception as error:
+                if attempt == self.retries or not is_transient(error):
+                    raise
+                self.retried += 1
+                delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+                time.sleep(delay * (0.5 + random.random() / 2))
+
+    def fetch_all(self, requests: Iterable[dict[str, any]]) -> Iterator[tuple[dict[str, any], list[dict]]]:
+        """
+        Yield (request, directions) as each response becomes available: cached ones first,
+        then the others in completion order, so rendering overlaps the remaining fetches.
+        Identical requests (e.g. a route shared by both best solutions) are fetched once.
+        Requests that still fail are reported, kept in `failures` and skipped.
+        """
+        self.failures = []
+        pending = {}
+        for request in requests:
+            directions = self.api.cached_directions(request['origin'], request['destination'], request['waypoints'], request.get('mode', 'driving'))
+            if directions is not None:
+                yield request, directions
+            else:
+                key = directions_key(request['origin'], request['destination'], request['waypoints'], request.get('mode', 'driving'))
+                pending.setdefault(key, []).append(request)
+
+        if not pending:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as executor:
+            futures = {executor.submit(self.fetch, same[0]): same for same in pending.values()}
+            for future in as_completed(futures):
+                try:
+                    directions = future.result()
+                except Exception as error:
+                    for request in futures[future]:
+                        print(f"Directions failed for route {request.get('route_id')}: {error!r}")
+                        self.failures.append((request, error))
+                    continue
+                for request in futures[future]:
+                    yield request, directions
@@ -1,6 +1,53 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from genetic_algorithm import GeneticAlgorithm
+from g_early_stopping import EarlyStopping
+from h_island_model import IslandModel, RING
+from _rng import seed_sequence
+from _observers import ConsoleLogger, JSONLWriter
+from delivery_setup.problem_instance import ProblemInstance, load_problem_instance
 from routes_evaluation import RouteEvaluator
 
+def init_sweep_worker():
+    # Each worker process renders its fitness plots with its own non-interactive backend
+    import matplotlib
+    matplotlib.use("Agg")
+
+def iteration_observers(metrics_dir: str, index: int, append: bool = False) -> tuple:
+    # Default progress output plus the iteration's metrics file (appended to when resuming)
+    return ConsoleLogger(), JSONLWriter(os.path.join(metrics_dir, f"i{index}.jsonl"), append=append)
+
+def run_iteration(index: int, params: dict[str, any], resume_from: str = None) -> dict[str, any]:
+    ga = GeneticAlgorithm(**params)
+    ga_metadata = ga.run(iterator=index, resume_from=resume_from)
+    return iteration_result(index, ga_metadata, ga.instance)
+
+def iteration_result(index: int, ga_metadata: dict[str, any], instance: ProblemInstance) -> dict[str, any]:
+    evaluator = RouteEvaluator(
+        routes_metadata=ga_metadata['routes_metadata'],
+        vehicle_data=instance.vehicles,
+        delivery_data=instance.deliveries
+    )
+    metrics = evaluator.metric_summary()
+
+    solution = {
+        'iteration': index+1,
+        'generation': ga_metadata['generation'],
+        'fitness': ga_metadata['fitness'],
+        'routes_metadata': ga_metadata['routes_metadata'],
+        'metrics': metrics,
+        'stop_reason': ga_metadata['stop_reason'],
+        'stop_generation': ga_metadata['stop_generation']
+    }
+
+    return {
+        'solution': solution,
+        'ga_metadata': ga_metadata,
+        'vehicle_data': instance.vehicles,
+        'delivery_data': instance.deliveries,
+        'depot_coords': instance.depot
+    }
+
 class Solution:
     def __init__(self, total_iterations: int):
         self.total_iterations = total_iterations
@@ -12,41 +59,89 @@ class Solution:
         self.best_solution_by_fitness = None
         self.best_solution_by_metrics = None
     
-    def heuristic_loop(self, city_code: str, population_length: tuple[int], max_generations: tuple[int], ratio_elitism: tuple[float], ratio_mutation: tuple[float], tournament_k: tuple[int]):
+    def iterations_params(self, city_code: str, population_length: tuple[int], max_generations: tuple[int], ratio_elitism: tuple[float], ratio_mutation: tuple[float], tournament_k: tuple[int], early_stopping: EarlyStopping = None, distance_matrix_path: str = None) -> list[dict[str, any]]:
         if not (len(population_length) == len(max_generations) == len(ratio_elitism) == len(ratio_mutation) == len(tournament_k) == self.total_iterations):
             raise ValueError("All parameter tuples must have the same length as total_iterations.")
         
-        for index in range(self.total_iterations):
-            ga = GeneticAlgorithm(
+        return [
+            dict(
                 city_code=city_code,
                 population_length=population_length[index],
                 max_generations=max_generations[index],
                 ratio_elitism=ratio_elitism[index],
                 ratio_mutation=ratio_mutation[index],
-                tournament_k=tournament_k[index]
+                tournament_k=tournament_k[index],
+                early_stopping=early_stopping,
+                # Precomputed (road network) distances; the instance pickles the matrix path, not the data
+                **({'instance': load_problem_instance(city_code, distance_matrix_path)} if distance_matrix_path is not None else {})
             )
-            self.ga_metadata = ga.run(iterator=index)
-            self.vehicle_data = ga.vehicles
-            self.delivery_data = ga.deliveries
-            self.depot_coords = ga.depot
-
-            evaluator = RouteEvaluator(
-                routes_metadata=self.ga_metadata['routes_metadata'],
-                vehicle_data=self.vehicle_data,
-                delivery_data=self.delivery_data
-            )
-            metrics = evaluator.metric_summary()
+            for index in range(self.total_iterations)
+        ]
+
+    def heuristic_loop(self, city_code: str, population_length: tuple[int], max_generations: tuple[int], ratio_elitism: tuple[float], ratio_mutation: tuple[float], tournament_k: tuple[int], workers: int = 1, early_stopping: EarlyStopping = None, checkpoint_dir: str = None, checkpoint_interval: int = 100, resume_from: str = None, seed: int = None, metrics_dir: str = None, distance_matrix_path: str = None):
+        """
+        Run the independent iterations. With `checkpoint_dir`, iteration i saves its state to
+        `checkpoint_dir/i{i}.npz` every `checkpoint_interval` generations and when it ends;
+        `resume_from` is a checkpoint directory of an interrupted sweep (also used for new
+        checkpoints when `checkpoint_dir` is not given): each iteration with a checkpoint
+        there continues from it (finished ones only rebuild their results), the others start over.
+        Each iteration gets its own RNG stream spawned from `seed`, whatever process runs it.
+        With `metrics_dir`, iteration i also streams its generation events to `metrics_dir/i{i}.jsonl`.
+        With `distance_matrix_path`, fitness uses that precomputed (road network) matrix.
+        """
+        iterations_params = self.iterations_params(city_code, population_length, max_generations, ratio_elitism, ratio_mutation, tournament_k, early_stopping, distance_matrix_path)
+        for params, iteration_seed in zip(iterations_params, seed_sequence(seed).spawn(len(iterations_params))):
+            params['seed'] = iteration_seed
+
+        checkpoint_dir = checkpoint_dir if checkpoint_dir is not None else resume_from
+        resume_paths = [None] * len(iterations_params)
+        for index, params in enumerate(iterations_params):
+            if checkpoint_dir is not None:
+                params.update(checkpoint_path=os.path.join(checkpoint_dir, f"i{index}.npz"), checkpoint_interval=checkpoint_interval)
+            if resume_from is not None and os.path.exists(os.path.join(resume_from, f"i{index}.npz")):
+                resume_paths[index] = os.path.join(resume_from, f"i{index}.npz")
+            if metrics_dir is not None:
+                params['observers'] = iteration_observers(metrics_dir, index, append=resume_paths[index] is not None)
+
+        if workers <= 1:
+            for index, params in enumerate(iterations_params):
+                self.collect_iteration(run_iteration(index, params, resume_paths[index]))
+            return
+
+        # Independent iterations, each one in its own process (at most `workers` at a time)
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_sweep_worker) as executor:
+            futures = [executor.submit(run_iteration, index, params, resume_paths[index]) for index, params in enumerate(iterations_params)]
+            for future in as_completed(futures):
+                self.collect_iteration(future.result())
+
+        self.solutions = dict(sorted(self.solutions.items()))
+
+    def island_loop(self, city_code: str, population_length: tuple[int], max_generations: tuple[int], ratio_elitism: tuple[float], ratio_mutation: tuple[float], tournament_k: tuple[int], workers: int = 1, early_stopping: EarlyStopping = None, migration_interval: int = 50, migration_size: int = 2, topology: str = RING, checkpoint_dir: str = None, checkpoint_interval: int = 100, resume_from: str = None, seed: int = None, metrics_dir: str = None, distance_matrix_path: str = None):
+        """
+        Same sweep as heuristic_loop, but the iterations are islands of one IslandModel that
+        exchange their best chromosomes every `migration_interval` generations. With
+        `checkpoint_dir`, all islands are saved together after the migrations (see
+        IslandModel); `resume_from` continues an interrupted sweep from that directory.
+        """
+        iterations_params = self.iterations_params(city_code, population_length, max_generations, ratio_elitism, ratio_mutation, tournament_k, early_stopping, distance_matrix_path)
+        if metrics_dir is not None:
+            for index, params in enumerate(iterations_params):
+                params['observers'] = iteration_observers(metrics_dir, index, append=resume_from is not None)
+        islands = IslandModel(iterations_params, migration_interval, migration_size, topology, workers, seed, checkpoint_dir, checkpoint_interval)
+
+        instance = load_problem_instance(city_code, distance_matrix_path)
+        for index, ga_metadata in enumerate(islands.run(resume_from)):
+            self.collect_iteration(iteration_result(index, ga_metadata, instance))
 
-            solution = {
-                'iteration': index+1,
-                'generation': self.ga_metadata['generation'],
-                'fitness': self.ga_metadata['fitness'],
-                'routes_metadata': self.ga_metadata['routes_metadata'],
-                'metrics': metrics
-            }
+    def collect_iteration(self, iteration_result: dict[str, any]):
+        solution = iteration_result['solution']
+        self.ga_metadata = iteration_result['ga_metadata']
+        self.vehicle_data = iteration_result['vehicle_data']
+        self.delivery_data = iteration_result['delivery_data']
+        self.depot_coords = iteration_result['depot_coords']
 
-            self.solutions[index] = solution
-            print(f"Completed iteration {index + 1}/{self.total_iterations}")
+        self.solutions[solution['iteration'] - 1] = solution
+        print(f"Completed iteration {solution['iteration']}/{self.total_iterations} ({len(self.solutions)} finished)")
 
     def best_solution(self, capacity_weight: float = 0.2, travel_weight: float = 0.4, critical_weight: float = 0.4) -> dict[str, any]:
         best_index = None
@@ -84,7 +179,8 @@ if __name__ == "__main__":
     solutions = Solution(total_iterations=20)
     city_code = "SP"
 
-    solutions.heuristic_loop(
+    # Each regime configuration is an island; islands share their best chromosomes in a ring
+    solutions.island_loop(
         city_code=city_code,
         population_length=(
             350, 380, 420, 320, 400, 360, 300,   # Regime A (7)
@@ -106,7 +202,17 @@ if __name__ == "__main__":
             2, 2, 3, 2, 3, 3, 2,
             3, 3, 4, 4, 3, 4, 3,
             4, 4, 4, 4, 4, 4
-        )
+        ),
+        workers=os.cpu_count(),
+        # Stop an iteration once its best fitness is flat for 300 generations
+        early_stopping=EarlyStopping(patience=300),
+        migration_interval=50,
+        migration_size=2,
+        topology=RING,
+        # All islands saved every 100 generations; GA_RESUME_FROM=checkpoints resumes an interrupted sweep
+        checkpoint_dir="checkpoints",
+        checkpoint_interval=100,
+        resume_from=os.getenv("GA_RESUME_FROM")
     )
 
     best_solutions = solutions.best_solution()
@@ -119,32 +225,36 @@ if __name__ == "__main__":
     from itinerary_routes.b_polyline_designer import PolylineDesigner
     from itinerary_routes.c_folium_path import FoliumPath
     from itinerary_routes.d_static_map import StaticMapRoute
+    from itinerary_routes.e_directions_fetcher import DirectionsFetcher, solution_route_requests
     from itinerary_routes._solution_type import SolutionMethod
 
     gmaps_api = GoogleMapsAPI()
-    origin = solutions.depot_coords  # Output from depot
-    destination = solutions.depot_coords  # Return to depot
     metadata_solutions = ((best_by_fitness, SolutionMethod.FITNESS), (best_by_metrics, SolutionMethod.METRICS))
 
-    solution_deliveries = []
-    for solution, sol_method in metadata_solutions:
-        for route in solution['routes_metadata'].keys():
-            for delivery in solution['routes_metadata'][route]:
-                delivery_id = int(delivery[0])
-                delivery_coords = (solutions.delivery_data[delivery_id]['lat'], solutions.delivery_data[delivery_id]['lon'])
-                solution_deliveries.append(delivery_coords)
-
-            solution_waypoints = solution_deliveries # Hospitals from delivery points
-
-            directions = gmaps_api.get_directions(origin, destination, solution_waypoints)
-            poly_designer = PolylineDesigner(directions)
-            coords, leg_starts = poly_designer.extract_coordinates_with_multicolors()
-
-            folium_path = FoliumPath(coords, leg_starts, iterator=solution['iteration'], generation=solution['generation'], route_id=route)
-            folium_path.create_html_map(sol_method)
-            static_map_route = StaticMapRoute(coords, leg_starts, iterator=solution['iteration'], generation=solution['generation'], route_id=route)
-            static_map_route.create_static_map(sol_method)
-            solution_deliveries = []  # Reset for next route
+    # Every route of both solutions (depot -> hospitals -> depot), fetched concurrently
+    route_requests = [
+        request
+        for solution, sol_method in metadata_solutions
+        for request in solution_route_requests(solution, sol_method, solutions.delivery_data, solutions.depot_coords)
+    ]
+    fetcher = DirectionsFetcher(gmaps_api, max_workers=8, requests_per_second=10)
+    # PNGs render in background threads, so the tile downloads of different routes overlap
+    render_pool = ThreadPoolExecutor(max_workers=4)
+    renders = []
+
+    # Each route is rendered as soon as its directions arrive
+    for request, directions in fetcher.fetch_all(route_requests):
+        solution, sol_method, route = request['solution'], request['solution_method'], request['route_id']
+        poly_designer = PolylineDesigner(directions)
+        coords, leg_starts = poly_designer.extract_coordinates_with_multicolors()
+
+        folium_path = FoliumPath(coords, leg_starts, iterator=solution['iteration'], generation=solution['generation'], route_id=route)
+        folium_path.create_html_map(sol_method)
+        static_map_route = StaticMapRoute(coords, leg_starts, iterator=solution['iteration'], generation=solution['generation'], route_id=route)
+        renders.append(render_pool.submit(static_map_route.create_static_map, sol_method))
+    for render in renders:
+        render.result()
+    render_pool.shutdown()
 
     from llm.chroma_db import main as generate_data_store
     from address_routes.einstein_units import hospitalar_units_lat_lon
@@ -0,0 +1,18 @@
+"""
+Build of the optional compiled kernels (_accel) used by the GA hot loops:
+
+    python setup.py build_ext --inplace
+
+The build is optional: without it (or without a C compiler) every kernel falls back to
+its pure-Python implementation. See _kernels.py.
+"""
+import sys
+from setuptools import setup, Extension
+
+# Keep the floating point operation order of the Python loops (no fused multiply-add)
+extra_compile_args = [] if sys.platform == "win32" else ["-O3", "-ffp-contract=off"]
+
+setup(
+    name="hospital-logistics-ga-kernels",
+    ext_modules=[Extension("_accel", ["_accel.c"], extra_compile_args=extra_compile_args)]
+)